@@ -3,10 +3,27 @@ from discord.ext import commands, tasks
 import aiosqlite
 import asyncio
 import os
-from datetime import datetime, timedelta
+import sys
+import queue
+import copy
+import atexit
+from datetime import datetime, timedelta, timezone
 import logging
+import logging.handlers
 import json
 import re
+import contextlib
+import hashlib
+import hmac
+import secrets
+import itertools
+import heapq
+import bisect
+import math
+import time
+import contextvars
+from collections import OrderedDict, defaultdict, deque
+from aiohttp import web
 from dotenv import load_dotenv, find_dotenv
 
 # requirements:
@@ -14,8 +31,67 @@ from dotenv import load_dotenv, find_dotenv
 # aiosqlite>=0.17.0
 # python-dotenv>=0.19.0
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging: JSON lines handed to a listener thread, so log I/O never blocks the event loop
+LOG_CONTEXT_FIELDS = ('guild_id', 'channel_id', 'user_id', 'challenge_id', 'command')
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+log = logging.getLogger("harrow")
+log_context = contextvars.ContextVar('log_context', default={})
+
+def bind_log_context(**fields):
+    """Attach fields to every record logged from the current task and tasks it starts"""
+    log_context.set({**log_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Captures the caller's log context and renders exceptions before the record leaves the loop"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.context = log_context.get()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            value = getattr(record, 'context', {}).get(field)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+def setup_logging(level, log_file):
+    """Route all logging through a queue to stdout and, if set, a rotating file"""
+    formatter = JsonFormatter()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(ContextQueueHandler(log_queue))
+    root.setLevel(level)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 # Bot configuration
 intents = discord.Intents.default()
@@ -24,30 +100,282 @@ intents.guilds = True
 intents.guild_messages = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class HarrowBot(commands.Bot):
+    async def setup_hook(self):
+        """Open long-lived resources once, before the gateway connects"""
+        instrument_http(self.http)
+        await db_manager.open()
+        await init_db()
+        await load_persistent_data()
+        write_queue.start()
+        state_snapshotter.start()
+        await channel_deletions.load()
+        await room_provider.load()
+        channel_deletions.start()
+        janitor.start()
+        if ingest_server:
+            await load_ingest_secret()
+            await ingest_server.start()
+        if metrics_server:
+            await metrics_server.start()
+
+    async def close(self):
+        """Release long-lived resources on shutdown"""
+        try:
+            if ingest_server:
+                await ingest_server.stop()
+            if metrics_server:
+                await metrics_server.stop()
+            janitor.cancel()
+            channel_deletions.stop()
+            timer_scheduler.stop()
+            channel_actors.stop()
+            outbound.stop()
+            await state_snapshotter.stop()
+            await write_queue.stop()
+            await db_manager.close()
+        except Exception:
+            log.exception("Error closing database")
+        await super().close()
+
+COMMAND_PREFIX = '!'
+
+bot = HarrowBot(command_prefix=COMMAND_PREFIX, intents=intents)
 
 # Resolve .env explicitly and log outcome
 env_path = find_dotenv(usecwd=True)
 loaded = load_dotenv(dotenv_path=env_path, override=False, verbose=True)
-print(f" 3 \n 2")
+log_listener = setup_logging(os.getenv("HARROW_LOG_LEVEL", "INFO").upper(),
+                             os.getenv("HARROW_LOG_FILE", "harrow.log"))
+log.info("Environment loaded from %s", env_path if loaded else "process environment only")
 token = os.getenv("DISCORD_TOKEN")
-print(f" {'1' if token else '..oops'}")
 
 if not token:
     raise RuntimeError("DISCORD_TOKEN not found in environment. Check .env and loading order.")
 
 # Database setup
 DB_PATH = "quiz_game.db"
+WRITE_BATCH_SIZE = 50  # Records per group commit
+WRITE_FLUSH_INTERVAL_MS = 250  # Max time a record waits in the write-behind queue
+STATE_SNAPSHOT_INTERVAL = 1.0  # Seconds between snapshots of changed in-memory game state
 
 # Game states
 active_games = {}
 active_challenges = {}
 challenge_channels = {}
 webhook_user_mappings = {}  # Maps webhook IDs to user IDs
+ingest_token_mappings = {}  # Maps HTTP ingest tokens to user IDs
 server_logging_channels = {}  # Maps guild IDs to logging channel IDs
+logging_channel_ids = set()  # Reverse index of server_logging_channels for the on_message hot path
+logging_channel_locks = defaultdict(asyncio.Lock)  # Guild ID -> lock so concurrent callers create one channel
 user_active_challenges = {}  # Maps user IDs to their current challenge channel IDs
 mono_sessions = {}  # Maps channel IDs to mono sessions
 
+# Optional local HTTP endpoint for Shortcuts answers (disabled unless a port is set)
+INGEST_HOST = os.getenv("HARROW_INGEST_HOST", "127.0.0.1")
+INGEST_PORT = int(os.getenv("HARROW_INGEST_PORT", "0") or 0)
+INGEST_PUBLIC_URL = os.getenv("HARROW_INGEST_PUBLIC_URL")  # URL phones should post to, if behind a proxy
+INGEST_RATE = (10, 5.0)  # Requests per token per period
+INGEST_MAX_BUCKETS = 1000  # Idle per-token buckets are pruned past this
+
+# Validated webhook cache
+WEBHOOK_CACHE_TTL = 3600  # Seconds a validated webhook (or a channel's webhook listing) is trusted
+
+# Member/display-name cache
+MEMBER_CACHE_TTL = 600  # Seconds before a cached member is re-resolved
+MEMBER_CACHE_SIZE = 5000
+
+# Metrics: in-process counters, gauges and histograms, exported in Prometheus text format
+METRICS_HOST = os.getenv("HARROW_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("HARROW_METRICS_PORT", "0") or 0)  # 0 disables the /metrics endpoint
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Metric:
+    """Base for registry metrics; values are keyed by a tuple of label values.
+
+    A callback, if given, is read at export time instead of stored values and
+    returns either a number or a {label values: number} dict.
+    """
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+        self.values = defaultdict(float)
+
+    def samples(self):
+        """Yield (suffix, labels dict, value) for export"""
+        values = self.values
+        if self.callback:
+            values = self.callback()
+            if not isinstance(values, dict):
+                values = {(): values}
+        for labels, value in values.items():
+            yield '', dict(zip(self.labelnames, labels)), value
+
+    def get(self, *labels):
+        return self.values.get(labels, 0)
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] += amount
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, *labels):
+        self.values[labels] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self.counts = {}  # labels: per-bucket counts, last slot is +Inf
+        self.sums = defaultdict(float)
+
+    def observe(self, value, *labels):
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    @contextlib.contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        return sum(self.counts.get(labels, ()))
+
+    def quantile(self, q, *labels):
+        """Estimate a quantile by interpolating within its bucket, as Prometheus does"""
+        counts = self.counts.get(labels)
+        if not counts:
+            return None
+        target = q * sum(counts)
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= target:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (target - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def samples(self):
+        for labels, counts in self.counts.items():
+            label_dict = dict(zip(self.labelnames, labels))
+            bounds = [f"{bound:g}" for bound in self.buckets] + ['+Inf']
+            for bound, cumulative in zip(bounds, itertools.accumulate(counts)):
+                yield '_bucket', {**label_dict, 'le': bound}, cumulative
+            yield '_sum', label_dict, self.sums[labels]
+            yield '_count', label_dict, sum(counts)
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+        self.started_at = time.time()
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{escape_label_value(val)}"' for key, val in labels.items())
+                value_text = format_sample_value(value)
+                lines.append(f"{metric.name}{suffix}{{{label_text}}} {value_text}" if label_text
+                             else f"{metric.name}{suffix} {value_text}")
+        return "\n".join(lines) + "\n"
+
+def format_sample_value(value):
+    """Exact exposition value; ':g' would round counters past six digits and flatten rate()"""
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value.is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(value)
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+metrics = MetricsRegistry()
+on_message_latency = metrics.register(Histogram(
+    'harrow_on_message_seconds', 'Time spent handling a gateway message', ('path',)))
+answers_scored = metrics.register(Counter(
+    'harrow_answers_scored_total', 'Answers applied to challenges', ('source',)))
+db_write_latency = metrics.register(Histogram(
+    'harrow_db_write_seconds', 'Time holding the writer lock per transaction, including commit'))
+rest_requests = metrics.register(Counter(
+    'harrow_rest_requests_total', 'Discord REST requests by route', ('route',)))
+rest_latency = metrics.register(Histogram(
+    'harrow_rest_request_seconds', 'Discord REST request time including rate-limit waits', ('route',)))
+rate_limit_hits = metrics.register(Counter(
+    'harrow_rate_limit_hits_total', 'Discord 429 responses by route', ('route',)))
+metrics.register(Gauge(
+    'harrow_write_queue_depth', 'Records waiting in the write-behind queue', callback=lambda: write_queue.depth))
+metrics.register(Counter(
+    'harrow_db_records_written_total', 'Records committed by the write-behind queue',
+    callback=lambda: write_queue.records_written))
+metrics.register(Counter(
+    'harrow_db_records_failed_total', 'Records the write-behind queue could not commit',
+    callback=lambda: write_queue.records_failed))
+metrics.register(Counter(
+    'harrow_db_batches_committed_total', 'Group commits made by the write-behind queue',
+    callback=lambda: write_queue.batches_committed))
+metrics.register(Gauge(
+    'harrow_active_sessions', 'In-progress challenges, mono sessions and group games', ('kind',),
+    callback=lambda: {('challenge',): len(challenge_channels), ('mono',): len(mono_sessions),
+                      ('game',): len(active_games)}))
+metrics.register(Gauge(
+    'harrow_channel_actors', 'Channels with a live event actor', callback=lambda: len(channel_actors.actors)))
+
+current_rest_route = contextvars.ContextVar('current_rest_route', default='unknown')
+
+def instrument_http(http):
+    """Count and time every REST call the bot makes, labelled by route template"""
+    original_request = http.request
+
+    async def request(route, **kwargs):
+        label = f"{route.method} {route.path}"
+        token = current_rest_route.set(label)
+        rest_requests.inc(label)
+        try:
+            with rest_latency.time(label):
+                return await original_request(route, **kwargs)
+        finally:
+            current_rest_route.reset(token)
+
+    http.request = request
+
+class RateLimitCounter(logging.Handler):
+    """discord.py retries 429s internally and only logs them; count those log records"""
+
+    def emit(self, record):
+        if record.getMessage().startswith("We are being rate limited"):
+            rate_limit_hits.inc(current_rest_route.get())
+
+logging.getLogger('discord.http').addHandler(RateLimitCounter(level=logging.WARNING))
+
 # Challenge types with scoring systems
 CHALLENGE_TYPES = {
     'classic': {
@@ -62,7 +390,8 @@ CHALLENGE_TYPES = {
         'description': 'Fast-paced with time pressure',
         'correct_points': 6,
         'wrong_points': -2,
-        'time_limit': 20
+        'time_limit': 20,
+        'speed_bonus': 2
     },
     'precision': {
         'name': 'Precision Challenge',
@@ -80,6 +409,61 @@ CHALLENGE_TYPES = {
     }
 }
 
+# Live scoreboard: one pinned message per challenge, edited at most once per interval
+LIVE_SCOREBOARD_DEFAULT = True
+SCOREBOARD_EDIT_INTERVAL = 1.0  # Seconds between scoreboard edits
+SCOREBOARD_RECENT_ANSWERS = 8  # Answer lines shown under the scores
+
+# Startup announcements
+WELCOME_CONCURRENCY = 5  # Guilds announced to in parallel
+WELCOME_COOLDOWN_HOURS = 24  # Don't re-announce to a guild within this window
+
+# Outbound dispatch: bot-initiated sends and edits, lowest priority number first
+PRIORITY_FEEDBACK = 0  # Answer confirmations and scoreboard edits
+PRIORITY_COMMAND = 1  # Challenge setup, results and other replies players are waiting on
+PRIORITY_TIMER = 2  # Question timer messages
+PRIORITY_ANNOUNCEMENT = 3  # Welcome broadcasts, restore notices and leaderboard refreshes
+PRIORITY_NAMES = {PRIORITY_FEEDBACK: 'feedback', PRIORITY_COMMAND: 'command',
+                  PRIORITY_TIMER: 'timer', PRIORITY_ANNOUNCEMENT: 'announcement'}
+OUTBOUND_CHANNEL_RATE = (5, 5.0)  # Requests per channel per period, Discord's message limit
+OUTBOUND_GLOBAL_RATE = (45, 1.0)  # Requests per period across the bot, under Discord's 50/s
+OUTBOUND_CONCURRENCY = 8  # REST calls in flight at once
+OUTBOUND_MAX_BUCKETS = 1000  # Idle per-channel buckets are pruned past this
+
+MONO_LEADERBOARD_SIZE = 10  # Rankings shown in mono leaderboard embeds
+
+# Janitor: sessions idle past their TTL are finalized automatically
+JANITOR_INTERVAL_MINUTES = 5
+CHALLENGE_IDLE_TTL = int(os.getenv("HARROW_CHALLENGE_IDLE_MINUTES", "60")) * 60  # Seconds
+MONO_IDLE_TTL = int(os.getenv("HARROW_MONO_IDLE_MINUTES", str(24 * 60))) * 60
+GAME_IDLE_TTL = int(os.getenv("HARROW_GAME_IDLE_MINUTES", str(6 * 60))) * 60
+
+# Challenge channel deletion: persisted in channel_deletions and worked off in the background
+CHANNEL_DELETE_GRACE = 10  # Seconds players get to read the results before the channel goes
+CHANNEL_DELETE_GUILD_RATE = (5, 10.0)  # Deletions per guild per period, well under Discord's channel limits
+CHANNEL_DELETE_CONCURRENCY = 4  # Deletions in flight at once
+CHANNEL_DELETE_MAX_ATTEMPTS = 5
+CHANNEL_DELETE_RETRY_BASE = 30  # Seconds before the first retry; doubles with each attempt
+
+# Challenge rooms: 'channel' creates and deletes a channel per challenge; opt into 'pool'
+# (recycles warm hidden channels) or 'thread' (opens private threads)
+ROOM_MODE = os.getenv("HARROW_ROOM_MODE", "channel").lower()
+ROOM_POOL_SIZE = int(os.getenv("HARROW_ROOM_POOL_SIZE", "3"))  # Idle rooms kept warm per guild
+ROOM_CATEGORY_NAME = "Harrow Challenges"  # Category holding pooled rooms
+ROOM_POOL_NAME = "challenge-room"  # Pooled rooms keep this name; Discord allows only 2 renames per 10 minutes
+ROOM_PURGE_LIMIT = 200  # Messages cleared when recycling; a room with more is deleted instead
+ROOM_THREAD_PARENT_NAME = "harrow-challenges"  # Channel private challenge threads are opened under
+ROOM_THREAD_ARCHIVE_MINUTES = 1440
+CATEGORY_CHANNEL_LIMIT = 50  # Discord's per-category channel cap
+
+# Server-wide leaderboard windows: name -> (label, days or None for all time)
+LEADERBOARD_WINDOWS = {
+    'week': ('This Week', 7),
+    'month': ('This Month', 30),
+    'all': ('All Time', None)
+}
+SERVER_LEADERBOARD_SIZE = 10
+
 GAME_MODES = {
     'classic': {'name': 'Classic', 'time_limit': None, 'bonus_multiplier': 1},
     'timed': {'name': 'Timed', 'time_limit': 30, 'bonus_multiplier': 1.2},
@@ -87,24 +471,108 @@ GAME_MODES = {
     'streak': {'name': 'Streak Master', 'time_limit': None, 'bonus_multiplier': 1.3}
 }
 
+class SortedLeaderboard:
+    """Entries kept in rank order so updates, rank lookups and top-K slices avoid re-sorting.
+
+    sort_key(entry) must return a tuple where smaller sorts first (better rank).
+    Ties keep insertion order, matching a stable sort.
+    """
+
+    def __init__(self, sort_key):
+        self.sort_key = sort_key
+        self.order = []  # Sorted (*sort_key, seq, entry_id)
+        self.keys = {}  # entry_id: its tuple in self.order
+        self.entries = {}  # entry_id: entry
+        self.seq = itertools.count()
+
+    def __len__(self):
+        return len(self.order)
+
+    def update(self, entry_id, entry):
+        """Insert an entry or move it to its new position after its score changed"""
+        old_key = self.keys.get(entry_id)
+        if old_key is not None:
+            seq = old_key[-2]
+            del self.order[bisect.bisect_left(self.order, old_key)]
+        else:
+            seq = next(self.seq)
+        key = (*self.sort_key(entry), seq, entry_id)
+        bisect.insort(self.order, key)
+        self.keys[entry_id] = key
+        self.entries[entry_id] = entry
+
+    def remove(self, entry_id):
+        key = self.keys.pop(entry_id, None)
+        if key is not None:
+            del self.order[bisect.bisect_left(self.order, key)]
+            del self.entries[entry_id]
+
+    def rank(self, entry_id):
+        """1-based rank of an entry, or None if it isn't on the board"""
+        key = self.keys.get(entry_id)
+        if key is None:
+            return None
+        return bisect.bisect_left(self.order, key) + 1
+
+    def top(self, k=None):
+        keys = self.order if k is None else self.order[:k]
+        return [self.entries[key[-1]] for key in keys]
+
 class MonoSession:
-    def __init__(self, creator_id, qbank_code, channel_id, title):
+    def __init__(self, creator_id, qbank_code, channel_id, title, guild_id=None):
         self.creator_id = creator_id
         self.qbank_code = qbank_code
         self.channel_id = channel_id
         self.title = title
+        self.guild_id = guild_id
         self.participants = {}  # user_id: MonoParticipant
+        self.leaderboard = SortedLeaderboard(lambda p: (-p.percentage, -p.total_score))
         self.is_active = True
         self.created_at = datetime.now()
+        self.db_id = None
+        self.last_activity = time.time()
 
     def add_participant(self, user_id, username):
         if user_id not in self.participants:
             self.participants[user_id] = MonoParticipant(user_id, username)
+            self.leaderboard.update(user_id, self.participants[user_id])
         return self.participants[user_id]
 
-    def get_leaderboard(self):
-        return sorted(self.participants.values(), 
-                     key=lambda p: (p.percentage, p.total_score), reverse=True)
+    def update_rank(self, user_id):
+        """Re-rank a participant after their result changed"""
+        self.leaderboard.update(user_id, self.participants[user_id])
+
+    def get_rank(self, user_id):
+        return self.leaderboard.rank(user_id)
+
+    def get_leaderboard(self, limit=None):
+        return self.leaderboard.top(limit)
+
+    def to_state(self):
+        return {
+            'creator_id': self.creator_id,
+            'qbank_code': self.qbank_code,
+            'channel_id': self.channel_id,
+            'title': self.title,
+            'guild_id': self.guild_id,
+            'created_at': self.created_at.isoformat(),
+            'db_id': self.db_id,
+            'last_activity': self.last_activity,
+            'participants': [vars(p) for p in self.participants.values()],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        session = cls(state['creator_id'], state['qbank_code'], state['channel_id'], state['title'],
+                      state.get('guild_id'))
+        session.created_at = datetime.fromisoformat(state['created_at'])
+        session.db_id = state['db_id']
+        session.last_activity = state.get('last_activity', session.last_activity)
+        for data in state['participants']:
+            participant = session.add_participant(data['user_id'], data['username'])
+            participant.__dict__.update(data)
+            session.update_rank(participant.user_id)
+        return session
 
 class MonoParticipant:
     def __init__(self, user_id, username):
@@ -132,20 +600,136 @@ class ChallengePlayer:
         self.wrong_count += 1
         self.total_points += points  # points will be negative
 
+SPEED_BONUS_FRACTION = 0.5  # A correct answer within this share of the time limit earns the type's speed_bonus
+
+class PaceTracker:
+    """Streaming inter-answer times for one player.
+
+    Gaps stay in a sorted list (bisect insertion), so each answer costs one
+    O(log n) insert and any quantile is an index lookup. An answer's gap is the
+    time since the player's previous answer message, split evenly across the
+    answers in a batch; a player's first answer has no gap.
+
+    record() also returns the message's own latency, unsplit and measured from
+    the challenge start for the first message, which is what speed bonuses use.
+    """
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at
+        self.last_answer_at = None
+        self.gaps = []
+
+    def record(self, message_at, count=1):
+        """Add a message's answers; returns its latency in seconds, or None if there's nothing to measure from"""
+        previous = self.started_at
+        if self.last_answer_at is not None:
+            previous = self.last_answer_at
+            gap = max(0.0, message_at - self.last_answer_at) / count
+            index = bisect.bisect_left(self.gaps, gap)
+            self.gaps[index:index] = [gap] * count
+        self.last_answer_at = message_at
+        return None if previous is None else max(0.0, message_at - previous)
+
+    def quantile(self, q):
+        if not self.gaps:
+            return None
+        return self.gaps[max(0, math.ceil(q * len(self.gaps)) - 1)]
+
+    def to_state(self):
+        return {'started_at': self.started_at, 'last_answer_at': self.last_answer_at, 'gaps': self.gaps}
+
+    @classmethod
+    def from_state(cls, state):
+        tracker = cls(state.get('started_at'))
+        tracker.last_answer_at = state['last_answer_at']
+        tracker.gaps = state['gaps']
+        return tracker
+
+def apply_challenge_answers(player, tracker, config, answers, message_at):
+    """Score one message's answers for a player; returns (points, speed bonuses earned).
+
+    The bonus depends on the message's latency and goes to its first correct
+    answer only, so batching answers can't multiply it. Shared by live scoring
+    and replay so both agree on the rules.
+    """
+    latency = tracker.record(message_at, len(answers))
+    fast = (latency is not None and config['time_limit']
+            and latency <= config['time_limit'] * SPEED_BONUS_FRACTION)
+    bonus = config.get('speed_bonus', 0) if fast else 0
+
+    points = 0
+    bonuses = 0
+    for answer in answers:
+        if answer == 'correct':
+            earned = config['correct_points'] + bonus
+            player.add_correct(earned)
+            bonuses += 1 if bonus else 0
+            bonus = 0
+        else:
+            earned = config['wrong_points']
+            player.add_wrong(earned)
+        points += earned
+    return points, bonuses
+
 class Challenge:
-    def __init__(self, challenger_id, challenged_id, challenge_type, qbank_code, main_channel_id):
+    def __init__(self, challenger_id, challenged_id, challenge_type, qbank_code, main_channel_id, guild_id=None):
         self.challenger_id = challenger_id
         self.challenged_id = challenged_id
         self.challenge_type = challenge_type
         self.qbank_code = qbank_code
         self.main_channel_id = main_channel_id
+        self.guild_id = guild_id
         self.players = {}
         self.is_active = False
         self.private_channel_id = None
         self.config = CHALLENGE_TYPES[challenge_type]
+        self.live_scoreboard = LIVE_SCOREBOARD_DEFAULT
+        self.scoreboard = None
+        self.challenge_id = secrets.token_hex(8)  # Links challenge_stats to its answer_events
+        self.pace = {}  # user_id: PaceTracker
+        self.last_activity = time.time()
+        self.started_at = time.time()  # First answers' speed bonus is measured from here
 
     def add_player(self, user_id, username):
         self.players[user_id] = ChallengePlayer(user_id, username)
+        self.pace[user_id] = PaceTracker(self.started_at)
+
+    def to_state(self):
+        scoreboard_message = self.scoreboard.message if self.scoreboard else None
+        return {
+            'challenger_id': self.challenger_id,
+            'challenged_id': self.challenged_id,
+            'challenge_type': self.challenge_type,
+            'qbank_code': self.qbank_code,
+            'main_channel_id': self.main_channel_id,
+            'guild_id': self.guild_id,
+            'challenge_id': self.challenge_id,
+            'last_activity': self.last_activity,
+            'started_at': self.started_at,
+            'private_channel_id': self.private_channel_id,
+            'is_active': self.is_active,
+            'live_scoreboard': self.live_scoreboard,
+            'scoreboard_message_id': scoreboard_message.id if scoreboard_message else None,
+            'players': [vars(p) for p in self.players.values()],
+            'pace': {str(user_id): tracker.to_state() for user_id, tracker in self.pace.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        challenge = cls(state['challenger_id'], state['challenged_id'], state['challenge_type'],
+                        state['qbank_code'], state['main_channel_id'], state.get('guild_id'))
+        challenge.challenge_id = state.get('challenge_id', challenge.challenge_id)
+        challenge.last_activity = state.get('last_activity', challenge.last_activity)
+        challenge.started_at = state.get('started_at')  # Snapshots from before started_at existed have none
+        challenge.private_channel_id = state['private_channel_id']
+        challenge.is_active = state['is_active']
+        challenge.live_scoreboard = state['live_scoreboard']
+        for data in state['players']:
+            challenge.add_player(data['user_id'], data['username'])
+            challenge.players[data['user_id']].__dict__.update(data)
+        for user_id, data in state.get('pace', {}).items():
+            challenge.pace[int(user_id)] = PaceTracker.from_state(data)
+        return challenge
 
     def get_winner(self):
         if len(self.players) < 2:
@@ -158,6 +742,293 @@ class Challenge:
         else:
             return None  # Tie
 
+class TokenBucket:
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now):
+        """Seconds until a token is available; 0 if one is available now"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    @property
+    def is_full(self):
+        return self.tokens >= self.capacity
+
+class OutboundJob:
+    __slots__ = ('priority', 'channel_id', 'target', 'method', 'kwargs', 'edit_key', 'future', 'enqueued_at')
+
+    def __init__(self, priority, channel_id, target, method, kwargs, edit_key=None):
+        self.priority = priority
+        self.channel_id = channel_id
+        self.target = target
+        self.method = method
+        self.kwargs = kwargs
+        self.edit_key = edit_key
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+class OutboundDispatcher:
+    """Sends and edits bot-initiated messages in priority order.
+
+    Each channel has its own token bucket and at most one request in flight, so
+    a channel's messages keep their order; a global bucket and a concurrency cap
+    bound the bot as a whole. Queued edits of the same message are merged, so a
+    burst of timer or scoreboard updates costs one request.
+    """
+
+    def __init__(self):
+        self.heap = []  # (priority, seq, job)
+        self.seq = itertools.count()
+        self.pending_edits = {}  # message_id: queued OutboundJob
+        self.channel_buckets = {}  # channel_id: TokenBucket
+        self.global_bucket = TokenBucket(*OUTBOUND_GLOBAL_RATE)
+        self.busy_channels = set()
+        self.in_flight = set()  # Running request tasks
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def send(self, channel, priority, **kwargs):
+        """Queue channel.send(**kwargs); await the result for the sent message"""
+        return self._submit(OutboundJob(priority, channel.id, channel, 'send', kwargs)).future
+
+    def call(self, channel, priority, method, **kwargs):
+        """Queue channel.<method>(**kwargs), e.g. a room edit or purge, behind the channel's bucket"""
+        return self._submit(OutboundJob(priority, channel.id, channel, method, kwargs)).future
+
+    def edit(self, message, priority, **kwargs):
+        """Queue message.edit(**kwargs), merging into an edit of the same message that hasn't started"""
+        job = self.pending_edits.get(message.id)
+        if job:
+            job.kwargs = {**job.kwargs, **kwargs}
+            outbound_coalesced.inc(PRIORITY_NAMES[priority])
+            if priority < job.priority:
+                # The merged edit goes out as soon as its most urgent part would have
+                job.priority = priority
+                self.heap = [(job.priority, seq, queued) if queued is job else (p, seq, queued)
+                             for p, seq, queued in self.heap]
+                heapq.heapify(self.heap)
+                self.wakeup.set()
+            return job.future
+        job = self._submit(OutboundJob(priority, message.channel.id, message, 'edit', kwargs, message.id))
+        self.pending_edits[message.id] = job
+        return job.future
+
+    def depth(self, priority=None):
+        return sum(1 for entry in self.heap if priority is None or entry[0] == priority)
+
+    def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        for task in list(self.in_flight):
+            task.cancel()
+        for *_, job in self.heap:
+            job.future.cancel()
+        self.heap.clear()
+        self.pending_edits.clear()
+
+    def _submit(self, job):
+        heapq.heappush(self.heap, (job.priority, next(self.seq), job))
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        self.wakeup.set()
+        return job
+
+    async def _run(self):
+        # Started by whichever handler sent first; don't inherit its log context
+        log_context.set({})
+        while True:
+            self.wakeup.clear()
+            delay = self._dispatch_ready()
+            if delay is None:
+                await self.wakeup.wait()
+            else:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+
+    def _dispatch_ready(self):
+        """Start every job allowed to go now; returns seconds until a bucket refills, or None to wait for a wake-up"""
+        now = time.monotonic()
+        deferred = []
+        delay = None
+        while self.heap and len(self.in_flight) < OUTBOUND_CONCURRENCY:
+            entry = heapq.heappop(self.heap)
+            job = entry[-1]
+            global_wait = self.global_bucket.wait_time(now)
+            if global_wait > 0:
+                deferred.append(entry)
+                delay = global_wait
+                break
+            if job.channel_id in self.busy_channels:
+                # Resumes when the channel's current request finishes
+                deferred.append(entry)
+                continue
+            bucket = self._bucket(job.channel_id)
+            wait = bucket.wait_time(now)
+            if wait > 0:
+                deferred.append(entry)
+                delay = wait if delay is None else min(delay, wait)
+                continue
+
+            self.global_bucket.take()
+            bucket.take()
+            if job.edit_key is not None and self.pending_edits.get(job.edit_key) is job:
+                del self.pending_edits[job.edit_key]
+            self.busy_channels.add(job.channel_id)
+            task = asyncio.create_task(self._execute(job))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+        for entry in deferred:
+            heapq.heappush(self.heap, entry)
+        return delay
+
+    def _bucket(self, channel_id):
+        bucket = self.channel_buckets.get(channel_id)
+        if bucket is None:
+            if len(self.channel_buckets) >= OUTBOUND_MAX_BUCKETS:
+                now = time.monotonic()
+                for idle_id in [cid for cid, b in self.channel_buckets.items()
+                                if cid not in self.busy_channels and b.wait_time(now) == 0 and b.is_full]:
+                    del self.channel_buckets[idle_id]
+            bucket = self.channel_buckets[channel_id] = TokenBucket(*OUTBOUND_CHANNEL_RATE)
+        return bucket
+
+    async def _execute(self, job):
+        outbound_wait.observe(time.monotonic() - job.enqueued_at, PRIORITY_NAMES[job.priority])
+        try:
+            result = await getattr(job.target, job.method)(**job.kwargs)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self.busy_channels.discard(job.channel_id)
+            self.wakeup.set()
+
+outbound = OutboundDispatcher()
+outbound_wait = metrics.register(Histogram(
+    'harrow_outbound_wait_seconds', 'Time a send or edit waited in the outbound queue', ('priority',)))
+outbound_coalesced = metrics.register(Counter(
+    'harrow_outbound_coalesced_total', 'Edits merged into an already queued edit', ('priority',)))
+metrics.register(Gauge(
+    'harrow_outbound_queue_depth', 'Sends and edits waiting in the outbound queue', ('priority',),
+    callback=lambda: {(name,): outbound.depth(priority) for priority, name in PRIORITY_NAMES.items()}))
+metrics.register(Gauge(
+    'harrow_outbound_in_flight', 'Outbound requests currently running', callback=lambda: len(outbound.in_flight)))
+
+scoreboard_edits = metrics.register(Counter(
+    'harrow_scoreboard_edits_total', 'Live scoreboard message edits'))
+scoreboard_answers = metrics.register(Counter(
+    'harrow_scoreboard_answers_total', 'Answers shown through live scoreboard edits'))
+
+class LiveScoreboard:
+    """Pinned scoreboard message that coalesces answers into debounced edits"""
+
+    def __init__(self, challenge, channel, interval=SCOREBOARD_EDIT_INTERVAL):
+        self.challenge = challenge
+        self.channel = channel
+        self.interval = interval
+        self.message = None
+        self.pending = []  # Answers received since the last edit
+        self.recent = []  # Answer lines currently shown, newest first
+        self.flush_task = None
+        self.last_edit = 0.0
+
+    @property
+    def is_live(self):
+        return self.message is not None
+
+    async def start(self):
+        self.message = await outbound.send(self.channel, PRIORITY_FEEDBACK, embed=self.build_embed())
+        try:
+            await self.message.pin(reason="Live challenge scoreboard")
+        except discord.HTTPException:
+            pass
+
+    def record(self, display_name, answers, points, via_shortcut=False):
+        """Queue a player's answers (one message's worth) and their net points for the next edit"""
+        self.pending.append((display_name, answers, points, via_shortcut))
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        # Keep going until answers that arrive during an edit are also shown
+        while self.pending and self.is_live:
+            delay = self.last_edit + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending or not self.is_live:
+            return
+        batch, self.pending = self.pending, []
+        for display_name, answers, points, via_shortcut in batch:
+            icons = ''.join('✅' if answer == 'correct' else '❌' for answer in answers[:10])
+            if len(answers) > 10:
+                icons += f"… ({len(answers)})"
+            sign = '+' if points > 0 else ''
+            via = ' (Shortcut)' if via_shortcut else ''
+            self.recent.insert(0, f"{icons} **{display_name}** {sign}{points}{via}")
+        del self.recent[SCOREBOARD_RECENT_ANSWERS:]
+        self.last_edit = time.monotonic()
+        try:
+            await outbound.edit(self.message, PRIORITY_FEEDBACK, embed=self.build_embed())
+            scoreboard_edits.inc()
+            scoreboard_answers.inc(amount=sum(len(answers) for _, answers, _, _ in batch))
+        except discord.NotFound:
+            # Scoreboard was deleted; post a fresh one, which already includes this batch
+            self.message = None
+            try:
+                await self.start()
+                state_snapshotter.mark('challenge', self.channel.id)  # Snapshots carry the message ID
+                scoreboard_answers.inc(amount=sum(len(answers) for _, answers, _, _ in batch))
+            except Exception:
+                # Answers fall back to per-answer embeds from here on
+                self.message = None
+                log.exception("Error re-posting live scoreboard")
+        except Exception:
+            log.exception("Error updating live scoreboard")
+
+    async def close(self):
+        """Show any answers still pending and stop editing"""
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.flush_task
+        await self.flush()
+        self.message = None
+
+    def build_embed(self):
+        embed = discord.Embed(
+            title=f"Live Scoreboard - {self.challenge.config['name']}",
+            color=0x3498db
+        )
+        for player in self.challenge.players.values():
+            embed.add_field(
+                name=player.username,
+                value=f"**Score:** {player.total_points}\n**Correct/Wrong:** {player.correct_count}/{player.wrong_count}",
+                inline=True
+            )
+        embed.add_field(
+            name="Latest Answers",
+            value="\n".join(self.recent) if self.recent else "No answers yet",
+            inline=False
+        )
+        embed.set_footer(text="Updates live | !scoreboard off for per-answer messages")
+        return embed
+
 class Player:
     def __init__(self, user_id, username):
         self.user_id = user_id
@@ -201,20 +1072,51 @@ class GameSession:
     def __init__(self, channel_id, mode='classic'):
         self.channel_id = channel_id
         self.players = {}
+        self.leaderboard = SortedLeaderboard(lambda p: (-p.score,))
         self.mode = mode
         self.is_active = False
         self.current_question = 0
         self.timer_task = None
         self.mode_config = GAME_MODES.get(mode, GAME_MODES['classic'])
+        self.last_activity = time.time()
 
     def add_player(self, user_id, username):
         if user_id not in self.players:
             self.players[user_id] = Player(user_id, username)
+            self.leaderboard.update(user_id, self.players[user_id])
         return self.players[user_id]
 
-    def get_leaderboard(self):
-        sorted_players = sorted(self.players.values(), key=lambda p: p.score, reverse=True)
-        return sorted_players
+    def update_rank(self, user_id):
+        """Re-rank a player; call after anything changes their score"""
+        self.leaderboard.update(user_id, self.players[user_id])
+
+    def get_rank(self, user_id):
+        return self.leaderboard.rank(user_id)
+
+    def get_leaderboard(self, limit=None):
+        return self.leaderboard.top(limit)
+
+    def to_state(self):
+        return {
+            'channel_id': self.channel_id,
+            'mode': self.mode,
+            'is_active': self.is_active,
+            'current_question': self.current_question,
+            'last_activity': self.last_activity,
+            'players': [vars(p) for p in self.players.values()],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        session = cls(state['channel_id'], state['mode'])
+        session.is_active = state['is_active']
+        session.current_question = state['current_question']
+        session.last_activity = state.get('last_activity', session.last_activity)
+        for data in state['players']:
+            player = session.add_player(data['user_id'], data['username'])
+            player.__dict__.update(data)
+            session.update_rank(player.user_id)
+        return session
 
 # Helper function to send welcome message
 async def send_welcome_message_to_guild(guild, is_startup=False):
@@ -289,104 +1191,294 @@ async def send_welcome_message_to_guild(guild, is_startup=False):
 
             embed.set_footer(text="Ready to battle? Type !gamehelp to see all commands!")
 
-            await target_channel.send(embed=embed)
-            print(f"Sent {'startup' if is_startup else 'welcome'} message to {guild.name}")
-    except Exception as e:
-        print(f"Error sending {'startup' if is_startup else 'welcome'} message to {guild.name}: {e}")
+            await send_with_retry(target_channel, priority=PRIORITY_ANNOUNCEMENT, embed=embed)
+            record_guild_announcement(guild.id)
+            log.info("Sent %s message to %s", 'startup' if is_startup else 'welcome', guild.name)
+            return True
+    except Exception:
+        log.exception("Error sending %s message to %s", 'startup' if is_startup else 'welcome', guild.name)
+    return False
+
+async def send_with_retry(channel, attempts=3, priority=PRIORITY_COMMAND, **kwargs):
+    """Send a message, backing off and retrying when Discord reports a rate limit"""
+    for attempt in range(attempts):
+        try:
+            return await outbound.send(channel, priority, **kwargs)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                rate_limit_hits.inc('POST /channels/{channel_id}/messages')
+            if e.status != 429 or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(getattr(e, 'retry_after', None) or 2 ** attempt)
 
 async def send_welcome_message_to_all_guilds():
-    """Send startup message to all guilds the bot is in"""
+    """Send startup message to every guild that hasn't been announced to recently"""
     try:
-        for guild in bot.guilds:
-            await send_welcome_message_to_guild(guild, is_startup=True)
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.5)
-        print(f"Sent startup messages to {len(bot.guilds)} guilds")
-    except Exception as e:
-        print(f"Error sending startup messages: {e}")
+        recently_announced = await get_recent_guild_announcements(WELCOME_COOLDOWN_HOURS)
+        pending = [guild for guild in bot.guilds if guild.id not in recently_announced]
+        semaphore = asyncio.Semaphore(WELCOME_CONCURRENCY)
+
+        async def announce(guild):
+            async with semaphore:
+                return await send_welcome_message_to_guild(guild, is_startup=True)
+
+        results = await asyncio.gather(*(announce(guild) for guild in pending))
+        log.info("Sent startup messages to %s guilds (%s announced within %sh, skipped)",
+                 sum(results), len(bot.guilds) - len(pending), WELCOME_COOLDOWN_HOURS)
+    except Exception:
+        log.exception("Error sending startup messages")
+
+class MemberCache:
+    """TTL/LRU cache of resolved members and their display names, keyed by (guild_id, user_id)"""
+
+    def __init__(self, ttl=MEMBER_CACHE_TTL, max_size=MEMBER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()  # (guild_id, user_id): (expires_at, member, display_name)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id, user_id):
+        key = (guild_id, user_id)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, guild_id, user_id, member, display_name):
+        key = (guild_id, user_id)
+        self.entries[key] = (time.monotonic() + self.ttl, member, display_name)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, guild_id, user_id):
+        self.entries.pop((guild_id, user_id), None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+member_cache = MemberCache()
+metrics.register(Counter(
+    'harrow_member_cache_lookups_total', 'Member cache lookups by result', ('result',),
+    callback=lambda: {('hit',): member_cache.hits, ('miss',): member_cache.misses}))
+metrics.register(Gauge(
+    'harrow_member_cache_size', 'Members held in the member cache', callback=lambda: len(member_cache.entries)))
+
+def display_name_of(member, user_id):
+    return member.display_name if hasattr(member, 'display_name') else member.name if member else f"User{user_id}"
+
+def get_cached_display_name(guild, user_id, fallback=None):
+    """Resolve a display name from the caches only; never makes a network call"""
+    guild_id = guild.id if guild else None
+    entry = member_cache.get(guild_id, user_id)
+    if entry:
+        return entry[2]
+    member = guild.get_member(user_id) if guild else None
+    if member:
+        member_cache.put(guild_id, user_id, member, member.display_name)
+        return member.display_name
+    return fallback or f"User{user_id}"
 
 # Helper function to get member reliably
 async def get_member_safely(guild, user_id):
     """Try multiple methods to get a guild member"""
     try:
+        entry = member_cache.get(guild.id, user_id)
+        if entry:
+            return entry[1]
+
         member = guild.get_member(user_id)
+        if not member:
+            try:
+                member = await guild.fetch_member(user_id)
+            except Exception:
+                member = None
+        if not member:
+            try:
+                user = await bot.fetch_user(user_id)
+                if user:
+                    member = guild.get_member(user_id) or user
+            except Exception:
+                pass
         if member:
-            return member
-        try:
-            member = await guild.fetch_member(user_id)
-            if member:
-                return member
-        except Exception:
-            pass
-        try:
-            user = await bot.fetch_user(user_id)
-            if user:
-                member = guild.get_member(user_id)
-                if member:
-                    return member
-                return user
-        except Exception:
-            pass
-        return None
-    except Exception as e:
-        print(f"Error getting member {user_id}: {e}")
+            member_cache.put(guild.id, user_id, member, display_name_of(member, user_id))
+        return member
+    except Exception:
+        log.exception("Error getting member %s", user_id)
         return None
 
 # Persistent webhook management functions
+class WebhookCache:
+    """Webhooks validated against Discord, trusted for a TTL.
+
+    A logging channel is warmed with one channel.webhooks() call, which
+    validates every user's webhook in that guild at once. While a channel's
+    listing is fresh, a webhook missing from the cache no longer exists.
+    """
+
+    def __init__(self, ttl=WEBHOOK_CACHE_TTL):
+        self.ttl = ttl
+        self.entries = {}  # webhook_id: (expires_at, webhook)
+        self.warmed = {}  # channel_id: expires_at
+        self.warming = {}  # channel_id: in-flight warm-up task
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, webhook_id):
+        entry = self.entries.get(webhook_id)
+        if entry is None or entry[0] < time.monotonic():
+            self.entries.pop(webhook_id, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, webhook):
+        self.entries[webhook.id] = (time.monotonic() + self.ttl, webhook)
+
+    def is_warm(self, channel_id):
+        return self.warmed.get(channel_id, 0) >= time.monotonic()
+
+    def invalidate_channel(self, channel_id):
+        self.warmed.pop(channel_id, None)
+        for webhook_id, (_, webhook) in list(self.entries.items()):
+            if webhook.channel_id == channel_id:
+                del self.entries[webhook_id]
+
+    async def warm(self, channel):
+        """Validate all webhooks in a channel with a single REST call; False if that isn't possible"""
+        if self.is_warm(channel.id):
+            return True
+        task = self.warming.get(channel.id)
+        if task is None:
+            task = asyncio.create_task(self._fetch_channel(channel))
+            self.warming[channel.id] = task
+            task.add_done_callback(lambda _: self.warming.pop(channel.id, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_channel(self, channel):
+        try:
+            webhooks = await channel.webhooks()
+        except Exception as e:
+            log.warning("Could not list webhooks in %s: %s", channel.id, e)
+            return False
+        self.invalidate_channel(channel.id)
+        for webhook in webhooks:
+            self.put(webhook)
+        self.warmed[channel.id] = time.monotonic() + self.ttl
+        return True
+
+webhook_cache = WebhookCache()
+metrics.register(Counter(
+    'harrow_webhook_cache_lookups_total', 'Validated-webhook cache lookups by result', ('result',),
+    callback=lambda: {('hit',): webhook_cache.hits, ('miss',): webhook_cache.misses}))
+
+async def validate_webhook(webhook_id, logging_channel):
+    """Return the webhook if it still exists, preferring the cache over REST calls"""
+    webhook = webhook_cache.get(webhook_id)
+    if webhook:
+        return webhook
+    if await webhook_cache.warm(logging_channel):
+        return webhook_cache.get(webhook_id)
+    # Listing the channel isn't permitted; fall back to fetching this webhook alone
+    webhook = await bot.fetch_webhook(webhook_id)
+    webhook_cache.put(webhook)
+    return webhook
+
+async def warm_webhook_cache():
+    """Validate every known logging channel's webhooks, one listing call per guild"""
+    semaphore = asyncio.Semaphore(WELCOME_CONCURRENCY)
+
+    async def warm(channel_id):
+        channel = bot.get_channel(channel_id)
+        if channel:
+            async with semaphore:
+                return await webhook_cache.warm(channel)
+        return False
+
+    results = await asyncio.gather(*(warm(channel_id) for channel_id in list(logging_channel_ids)))
+    log.info("Validated webhooks in %s logging channel(s)", sum(results))
+
+def register_logging_channel(guild_id, channel_id):
+    """Record a guild's logging channel, keeping the reverse index in sync"""
+    previous_id = server_logging_channels.get(guild_id)
+    server_logging_channels[guild_id] = channel_id
+    if previous_id is not None and previous_id != channel_id:
+        logging_channel_ids.discard(previous_id)
+    logging_channel_ids.add(channel_id)
+
+def unregister_logging_channel(guild_id):
+    channel_id = server_logging_channels.pop(guild_id, None)
+    if channel_id is not None:
+        logging_channel_ids.discard(channel_id)
+
 async def get_or_create_logging_channel(guild):
     """Get or create the persistent logging channel for this server"""
-    try:
-        # Check if we already have a logging channel stored
-        if guild.id in server_logging_channels:
-            channel_id = server_logging_channels[guild.id]
-            channel = guild.get_channel(channel_id)
-            if channel:
-                return channel
-
-        # Look for existing logging channel
-        for channel in guild.text_channels:
-            if channel.name in ['quiz-bot-input', 'bot-logging', 'apple-shortcuts-input']:
-                server_logging_channels[guild.id] = channel.id
-                await save_logging_channel(guild.id, channel.id)
-                return channel
-
-        # Create new logging channel
+    async with logging_channel_locks[guild.id]:
         try:
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True, manage_webhooks=True)
-            }
-
-            channel = await guild.create_text_channel(
-                name="quiz-bot-input",
-                topic="Shortcuts webhook input channel - Do not delete!",
-                overwrites=overwrites,
-                reason="Quiz bot persistent logging channel"
-            )
+            # Check if we already have a logging channel stored
+            if guild.id in server_logging_channels:
+                channel_id = server_logging_channels[guild.id]
+                channel = guild.get_channel(channel_id)
+                if channel:
+                    return channel
+                # Stored channel was deleted
+                unregister_logging_channel(guild.id)
+
+            # Look for existing logging channel
+            for channel in guild.text_channels:
+                if channel.name in ['quiz-bot-input', 'bot-logging', 'apple-shortcuts-input']:
+                    await save_logging_channel(guild.id, channel.id)
+                    return channel
 
-            server_logging_channels[guild.id] = channel.id
-            await save_logging_channel(guild.id, channel.id)
+            # Create new logging channel
+            try:
+                overwrites = {
+                    guild.default_role: discord.PermissionOverwrite(read_messages=False),
+                    guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True, manage_webhooks=True)
+                }
+
+                channel = await guild.create_text_channel(
+                    name="quiz-bot-input",
+                    topic="Shortcuts webhook input channel - Do not delete!",
+                    overwrites=overwrites,
+                    reason="Quiz bot persistent logging channel"
+                )
 
-            # Send setup message
-            embed = discord.Embed(
-                title="Quiz Bot Logging Channel Created",
-                description="This channel is used for Shortcuts integration.\n"
-                           "Your personal webhooks will post here, and messages will be relayed to active challenge channels.",
-                color=0x3498db
-            )
-            await channel.send(embed=embed)
-            print(f"Created logging channel: {channel.name} in {guild.name}")
-            return channel
+                await save_logging_channel(guild.id, channel.id)
 
-        except discord.Forbidden:
-            print(f"Failed to create logging channel in {guild.name} - no permissions")
-            return None
-        except Exception as e:
-            print(f"Error creating logging channel in {guild.name}: {e}")
+                # Send setup message
+                embed = discord.Embed(
+                    title="Quiz Bot Logging Channel Created",
+                    description="This channel is used for Shortcuts integration.\n"
+                               "Your personal webhooks will post here, and messages will be relayed to active challenge channels.",
+                    color=0x3498db
+                )
+                await outbound.send(channel, PRIORITY_ANNOUNCEMENT, embed=embed)
+                log.info("Created logging channel: %s in %s", channel.name, guild.name)
+                return channel
+
+            except discord.Forbidden:
+                log.warning("Failed to create logging channel in %s - no permissions", guild.name)
+                return None
+            except Exception:
+                log.exception("Error creating logging channel in %s", guild.name)
+                return None
+        except Exception:
+            log.exception("Error in get_or_create_logging_channel")
             return None
-    except Exception as e:
-        print(f"Error in get_or_create_logging_channel: {e}")
-        return None
 
 async def get_or_create_persistent_webhook(user_id, guild):
     """Get or create a persistent webhook for a user in the server's logging channel"""
@@ -401,31 +1493,34 @@ async def get_or_create_persistent_webhook(user_id, guild):
             webhook_id, webhook_url = webhook_data
             # Verify webhook still exists
             try:
-                webhook = await bot.fetch_webhook(webhook_id)
-                if webhook and webhook.channel_id == logging_channel.id:
-                    webhook_user_mappings[webhook_id] = user_id
-                    return webhook
+                webhook = await validate_webhook(webhook_id, logging_channel)
             except Exception:
+                webhook = None
+            if webhook and webhook.channel_id == logging_channel.id:
+                webhook_user_mappings[webhook_id] = user_id
+                return webhook
+            if not webhook:
                 # Webhook was deleted, remove from database
                 await remove_user_webhook_from_db(user_id, guild.id)
 
         # Create new webhook
         try:
             user = await get_member_safely(guild, user_id)
-            username = user.display_name if hasattr(user, 'display_name') else user.name if user else f"User{user_id}"
+            username = display_name_of(user, user_id)
             webhook = await logging_channel.create_webhook(name=f"{username} Logger")
             webhook_user_mappings[webhook.id] = user_id
+            webhook_cache.put(webhook)
 
             # Save to database
             await save_user_webhook_to_db(user_id, guild.id, webhook.id, webhook.url)
-            print(f"Created persistent webhook for {username} in {guild.name}")
+            log.info("Created persistent webhook for %s in %s", username, guild.name)
             return webhook
 
-        except Exception as e:
-            print(f"Error creating webhook for user {user_id} in {guild.name}: {e}")
+        except Exception:
+            log.exception("Error creating webhook for user %s in %s", user_id, guild.name)
             return None
-    except Exception as e:
-        print(f"Error in get_or_create_persistent_webhook: {e}")
+    except Exception:
+        log.exception("Error in get_or_create_persistent_webhook")
         return None
 
 def get_user_from_webhook_message(message):
@@ -439,75 +1534,381 @@ def get_user_from_webhook_message(message):
     except Exception:
         return None
 
-def extract_answer_from_content(content):
-    """Extract Y/N answer from message content"""
+# Answer parsing: whole words, separated single marks (Y N Y, + + -) and repeats (Y x5, N*3).
+# Unseparated runs of marks ('YYN', 'nyc', '----') read as chat, letters and symbols alike.
+ANSWER_WORDS = {
+    'YES': 'correct', 'CORRECT': 'correct',
+    'NO': 'wrong', 'WRONG': 'wrong'
+}
+ANSWER_MARKS = {
+    'Y': 'correct', 'C': 'correct', '+': 'correct',
+    'N': 'wrong', 'W': 'wrong', '-': 'wrong'
+}
+MAX_BATCH_ANSWERS = 50
+MENTION_PATTERN = re.compile(r'<@!?\d+>\s*')
+REPEAT_PATTERN = re.compile(r'\s*[X*]\s*(\d+)\b')
+TOKEN_SEPARATOR_PATTERN = re.compile(r'[\s,]+')
+
+def extract_answers_from_content(content):
+    """Extract every Y/N answer from message content, in order; [] if it isn't an answer message"""
     try:
         if not content:
-            return None
-        cleaned_content = re.sub(r'<@!?\d+>\s*', '', content).strip().upper()
-        if cleaned_content in ['Y', 'C', '+', 'YES', 'CORRECT']:
-            return 'correct'
-        elif cleaned_content in ['N', 'W', '-', 'NO', 'WRONG']:
-            return 'wrong'
-        return None
+            return []
+        cleaned_content = MENTION_PATTERN.sub('', content).strip().upper()
+        # 'Y x5' / 'YX5' / 'Y*5' all become 'Y *5'
+        cleaned_content = REPEAT_PATTERN.sub(r' *\1', cleaned_content)
+
+        answers = []
+        last_group = None
+        for token in TOKEN_SEPARATOR_PATTERN.split(cleaned_content):
+            if not token:
+                continue
+            if token.startswith('*') and token[1:].isdigit() and last_group:
+                repeats = int(token[1:]) - 1
+                if repeats < 0 or len(answers) + len(last_group) * repeats > MAX_BATCH_ANSWERS:
+                    return []
+                answers.extend(last_group * repeats)
+                last_group = None
+            elif token in ANSWER_WORDS:
+                last_group = [ANSWER_WORDS[token]]
+                answers.extend(last_group)
+            elif token in ANSWER_MARKS:
+                last_group = [ANSWER_MARKS[token]]
+                answers.extend(last_group)
+            else:
+                # Anything else means this is chat, not answers
+                return []
+            if len(answers) > MAX_BATCH_ANSWERS:
+                return []
+        return answers
     except Exception:
-        return None
+        return []
+
+def extract_answer_from_content(content):
+    """Extract a single Y/N answer from message content"""
+    answers = extract_answers_from_content(content)
+    return answers[0] if len(answers) == 1 else None
+
+class ChannelActor:
+    """Owns every state change for one challenge or game channel.
+
+    Events go through a priority queue keyed by Discord snowflake and one
+    consumer task applies them one at a time, so concurrent handlers can't
+    interleave and a busy channel only ever delays itself.
+    """
 
-async def relay_message_to_challenge_channels(user_id, answer, original_message):
-    """Relay a webhook message to the user's active challenge channel(s)"""
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+        self.queue = asyncio.PriorityQueue()
+        self.seq = itertools.count()  # Tie-breaker so handlers are never compared
+        self.closed = False
+        self.task = asyncio.create_task(self._run())
+
+    def submit(self, snowflake, handler, *args):
+        """Queue handler(*args); the returned future resolves to its result, or None if dropped"""
+        future = asyncio.get_running_loop().create_future()
+        if self.closed:
+            future.set_result(None)
+        else:
+            # The submitter's log context travels with the event to the consumer task
+            self.queue.put_nowait((snowflake, next(self.seq), handler, args, future, log_context.get()))
+        return future
+
+    async def close(self, snowflake=float('inf')):
+        """Apply events ordered before snowflake, then drop everything else"""
+        await self.submit(snowflake, None)
+
+    async def _run(self):
+        while True:
+            snowflake, _, handler, args, future, context = await self.queue.get()
+            if handler is None:
+                break
+            log_context.set(context)
+            try:
+                result = await handler(*args)
+            except Exception:
+                log.exception("Error applying event in channel %s", self.channel_id)
+                result = None
+            if not future.done():
+                future.set_result(result)
+
+        self.closed = True
+        future.set_result(None)
+        while not self.queue.empty():
+            future = self.queue.get_nowait()[4]
+            if not future.done():
+                future.set_result(None)
+
+class ActorRegistry:
+    def __init__(self):
+        self.actors = {}  # channel_id: ChannelActor
+
+    @staticmethod
+    def has_live_session(channel_id):
+        challenge = challenge_channels.get(channel_id)
+        return (challenge is not None and challenge.is_active) or channel_id in active_games
+
+    def submit(self, channel_id, snowflake, handler, *args):
+        actor = self.actors.get(channel_id)
+        if actor is None and self.has_live_session(channel_id):
+            actor = self.actors[channel_id] = ChannelActor(channel_id)
+        if actor is None:
+            # Late event for a finished session; recreating the actor would leak it
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+            return future
+        return actor.submit(snowflake, handler, *args)
+
+    async def close(self, channel_id, snowflake=float('inf')):
+        actor = self.actors.get(channel_id)
+        if actor:
+            await actor.close(snowflake)
+            if self.actors.get(channel_id) is actor:
+                del self.actors[channel_id]
+
+    def stop(self):
+        for actor in self.actors.values():
+            actor.task.cancel()
+        self.actors.clear()
+
+channel_actors = ActorRegistry()
+
+def now_snowflake():
+    """Snowflake for events that don't come from a Discord message (HTTP ingest)"""
+    return discord.utils.time_snowflake(discord.utils.utcnow())
+
+def build_answer_embed(display_name, player, answer, points, via_shortcut=False):
+    via = " (via Shortcut)" if via_shortcut else ""
+    if answer == 'correct':
+        embed = discord.Embed(
+            title=f"Correct!{via}",
+            description=f"**{display_name}** +{points} points",
+            color=0x00ff00
+        )
+    else:
+        embed = discord.Embed(
+            title=f"Wrong!{via}",
+            description=f"**{display_name}** {points} points",
+            color=0xff0000
+        )
+    embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
+    embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
+    return embed
+
+def build_batch_answer_embed(display_name, player, answers, points, via_shortcut=False):
+    via = " (via Shortcut)" if via_shortcut else ""
+    correct = answers.count('correct')
+    sign = '+' if points > 0 else ''
+    embed = discord.Embed(
+        title=f"{len(answers)} Answers Recorded!{via}",
+        description=f"**{display_name}** {correct} correct, {len(answers) - correct} wrong ({sign}{points} points)",
+        color=0x00ff00 if points >= 0 else 0xff0000
+    )
+    embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
+    embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
+    return embed
+
+def submit_challenge_answer(challenge, user_id, answers, channel, snowflake, source='direct'):
+    """Queue answers on the challenge channel's actor; resolves to True once they are scored.
+
+    source is 'direct' (typed in the challenge channel), 'webhook' (Shortcut via a
+    Discord webhook) or 'http' (Shortcut via the ingest endpoint).
+    """
+    return channel_actors.submit(channel.id, snowflake, score_challenge_answer,
+                                 challenge, user_id, answers, channel, snowflake, source)
+
+async def score_challenge_answer(challenge, user_id, answers, channel, snowflake, source='direct'):
+    """Apply one message's answers to a challenge player and report them with a single update.
+
+    Runs on the channel's actor; use submit_challenge_answer rather than calling this directly.
+    """
+    if not answers or not challenge.is_active:
+        return False
+    bind_log_context(challenge_id=challenge.challenge_id)
+    challenge.last_activity = time.time()
+    record_answer_events(challenge, user_id, answers, source, snowflake)
+    answers_scored.inc(source, amount=len(answers))
+    via_shortcut = source != 'direct'
+    player = challenge.players[user_id]
+    display_name = get_cached_display_name(channel.guild, user_id, player.username)
+
+    message_at = discord.utils.snowflake_time(snowflake).timestamp()
+    points, _ = apply_challenge_answers(player, challenge.pace[user_id], challenge.config, answers, message_at)
+
+    state_snapshotter.mark('challenge', channel.id)
+    if challenge.config['time_limit']:
+        timer_scheduler.reset(channel.id)
+
+    if challenge.scoreboard and challenge.scoreboard.is_live:
+        challenge.scoreboard.record(display_name, answers, points, via_shortcut)
+    elif len(answers) == 1:
+        await outbound.send(channel, PRIORITY_FEEDBACK,
+                            embed=build_answer_embed(display_name, player, answers[0], points, via_shortcut))
+    else:
+        await outbound.send(channel, PRIORITY_FEEDBACK,
+                            embed=build_batch_answer_embed(display_name, player, answers, points, via_shortcut))
+    return True
+
+async def start_live_scoreboard(challenge, channel):
+    """Post and pin the live scoreboard for a challenge"""
+    try:
+        scoreboard = LiveScoreboard(challenge, channel)
+        await scoreboard.start()
+        challenge.scoreboard = scoreboard
+        state_snapshotter.mark('challenge', channel.id)
+    except Exception:
+        log.exception("Error starting live scoreboard")
+
+async def relay_message_to_challenge_channels(user_id, answers, original_message):
+    """Relay Shortcut answers to the user's active challenge channel; True if they were scored"""
     try:
         if user_id not in user_active_challenges:
-            return
+            return False
 
         challenge_channel_id = user_active_challenges[user_id]
         if challenge_channel_id not in challenge_channels:
             # Clean up stale mapping
             del user_active_challenges[user_id]
-            return
+            return False
 
         challenge = challenge_channels[challenge_channel_id]
         if not challenge.is_active or user_id not in challenge.players:
-            return
+            return False
 
         challenge_channel = bot.get_channel(challenge_channel_id)
         if not challenge_channel:
-            return
+            return False
 
-        # Process the answer in the challenge channel
-        player = challenge.players[user_id]
+        if original_message:
+            snowflake, source = original_message.id, 'webhook'
+        else:
+            snowflake, source = now_snowflake(), 'http'
+        return bool(await submit_challenge_answer(challenge, user_id, answers, challenge_channel,
+                                                  snowflake, source))
+    except Exception:
+        log.exception("Error in relay_message_to_challenge_channels")
+        return False
 
-        # Get user display name
-        try:
-            guild_member = await get_member_safely(original_message.guild, user_id)
-            display_name = guild_member.display_name if hasattr(guild_member, 'display_name') else guild_member.name if guild_member else f"User{user_id}"
-        except Exception:
-            display_name = f"User{user_id}"
+# Local HTTP ingestion: Shortcuts post straight to the bot instead of a Discord webhook
+ingest_secret = None  # HMAC key for ingest tokens, loaded from env or bot_meta at startup
 
-        if answer == 'correct':
-            points = challenge.config['correct_points']
-            player.add_correct(points)
-            embed = discord.Embed(
-                title="Correct! (via Shortcut)",
-                description=f"**{display_name}** +{points} points",
-                color=0x00ff00
-            )
-            embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
-            embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
-            await challenge_channel.send(embed=embed)
+def sign_ingest_token(user_id, nonce):
+    payload = f"{user_id}.{nonce}"
+    signature = hmac.new(ingest_secret.encode(), payload.encode(), hashlib.sha256).hexdigest()[:32]
+    return f"{payload}.{signature}"
 
-        elif answer == 'wrong':
-            points = challenge.config['wrong_points']
-            player.add_wrong(points)
-            embed = discord.Embed(
-                title="Wrong! (via Shortcut)",
-                description=f"**{display_name}** {points} points",
-                color=0xff0000
-            )
-            embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
-            embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
-            await challenge_channel.send(embed=embed)
-    except Exception as e:
-        print(f"Error in relay_message_to_challenge_channels: {e}")
+def verify_ingest_token(token):
+    """Return the user ID for a valid, current ingest token, else None"""
+    try:
+        user_id, nonce, _ = token.split('.')
+        expected = sign_ingest_token(int(user_id), nonce)
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(expected, token):
+        return None
+    # Only the most recently issued token for a user is accepted
+    return ingest_token_mappings.get(token)
+
+async def load_ingest_secret():
+    global ingest_secret
+    ingest_secret = os.getenv("HARROW_INGEST_SECRET") or await get_bot_meta('ingest_secret')
+    if not ingest_secret:
+        ingest_secret = secrets.token_hex(32)
+        await set_bot_meta('ingest_secret', ingest_secret)
+
+async def issue_ingest_token(user_id):
+    """Create a new token for a user, revoking any previous one"""
+    token = sign_ingest_token(user_id, secrets.token_hex(8))
+    for old_token, old_user_id in list(ingest_token_mappings.items()):
+        if old_user_id == user_id:
+            del ingest_token_mappings[old_token]
+    ingest_token_mappings[token] = user_id
+    await save_ingest_token_to_db(user_id, token)
+    return token
+
+ingest_buckets = {}  # user_id: TokenBucket
+
+def take_ingest_token_slot(user_id):
+    """Spend one of a user's ingest requests; returns seconds to wait if none are left, else 0"""
+    now = time.monotonic()
+    bucket = ingest_buckets.get(user_id)
+    if bucket is None:
+        if len(ingest_buckets) >= INGEST_MAX_BUCKETS:
+            for idle_id in [uid for uid, b in ingest_buckets.items() if b.wait_time(now) == 0 and b.is_full]:
+                del ingest_buckets[idle_id]
+        bucket = ingest_buckets[user_id] = TokenBucket(*INGEST_RATE)
+    wait = bucket.wait_time(now)
+    if wait == 0:
+        bucket.take()
+    return wait
+
+def get_ingest_url():
+    return INGEST_PUBLIC_URL or f"http://{INGEST_HOST}:{INGEST_PORT}/answer"
+
+async def handle_ingest_answer(request):
+    """POST /answer with `Authorization: Bearer <token>` and `{"content": "Y"}`"""
+    # Header only: tokens in query strings end up in proxy and access logs
+    auth = request.headers.get('Authorization', '')
+    user_id = verify_ingest_token(auth[7:]) if auth.startswith('Bearer ') else None
+    if not user_id:
+        return web.json_response({'ok': False, 'error': 'invalid token'}, status=401)
+    bind_log_context(user_id=user_id, command='ingest')
+
+    wait = take_ingest_token_slot(user_id)
+    if wait:
+        return web.json_response({'ok': False, 'error': 'rate limited'}, status=429,
+                                 headers={'Retry-After': str(math.ceil(wait))})
+
+    try:
+        if request.content_type == 'application/json':
+            content = (await request.json()).get('content')
+        else:
+            content = (await request.post()).get('content') or await request.text()
+    except Exception:
+        return web.json_response({'ok': False, 'error': 'malformed body'}, status=400)
+
+    answers = extract_answers_from_content(content)
+    if not answers:
+        return web.json_response({'ok': False, 'error': 'unrecognised answer'}, status=400)
+
+    if not await relay_message_to_challenge_channels(user_id, answers, None):
+        return web.json_response({'ok': False, 'error': 'no active challenge'}, status=409)
+    return web.json_response({'ok': True, 'answers': answers})
+
+class LocalHttpServer:
+    """aiohttp server running inside the bot's event loop"""
+
+    def __init__(self, name, host, port, routes, client_max_size=4096):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.app = web.Application(client_max_size=client_max_size)
+        self.app.router.add_routes(routes)
+        self.runner = None
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        log.info("%s endpoint listening on http://%s:%s", self.name, self.host, self.port)
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+async def handle_metrics(request):
+    return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8',
+                        headers={'X-Prometheus-Format': '0.0.4'})
+
+ingest_server = LocalHttpServer("Ingest", INGEST_HOST, INGEST_PORT,
+                                [web.post('/answer', handle_ingest_answer)]) if INGEST_PORT else None
+metrics_server = LocalHttpServer("Metrics", METRICS_HOST, METRICS_PORT,
+                                 [web.get('/metrics', handle_metrics)]) if METRICS_PORT else None
+
+def bind_interaction_log_context(interaction, command):
+    bind_log_context(guild_id=interaction.guild_id, channel_id=interaction.channel_id,
+                     user_id=interaction.user.id, command=command)
 
 # Challenge View with Accept/Decline buttons
 class ChallengeView(discord.ui.View):
@@ -518,48 +1919,66 @@ class ChallengeView(discord.ui.View):
         self.challenge_type = challenge_type
         self.qbank_code = qbank_code
         self.main_channel_id = main_channel_id
+        self.accepted = False
 
     @discord.ui.button(label='Accept Challenge', style=discord.ButtonStyle.success)
     async def accept_challenge(self, interaction: discord.Interaction, button: discord.ui.Button):
+        bind_interaction_log_context(interaction, 'accept_challenge')
         try:
             if interaction.user.id != self.challenged_id:
                 await interaction.response.send_message("Only the challenged player can accept this challenge!", ephemeral=True)
                 return
 
-            guild = interaction.guild
-            challenger = await get_member_safely(guild, self.challenger_id)
-            challenged = await get_member_safely(guild, self.challenged_id)
-            challenger_name = challenger.display_name if hasattr(challenger, "display_name") else challenger.name if challenger else f"User{self.challenger_id}"
-            challenged_name = challenged.display_name if hasattr(challenged, "display_name") else challenged.name if challenged else f"User{self.challenged_id}"
+            if self.accepted:
+                await interaction.response.send_message("This challenge is already being set up!", ephemeral=True)
+                return
 
+            guild = interaction.guild
             bot_member = guild.get_member(bot.user.id)
-            if not bot_member or not bot_member.guild_permissions.manage_channels:
-                await interaction.response.send_message("I do not have permission to create channels! Please ensure I have 'Manage Channels' permission.", ephemeral=True)
+            missing = room_provider.missing_permissions(bot_member) if bot_member else ['Manage Channels']
+            if missing:
+                await interaction.response.send_message(f"I can't set up challenge rooms! Please ensure I have these permissions: {', '.join(missing)}.", ephemeral=True)
                 return
 
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                bot_member: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True)
-            }
+            self.accepted = True
+            timings = {}
+            started = time.perf_counter()
 
-            if challenger and hasattr(challenger, "guild_permissions"):
-                overwrites[challenger] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-            if challenged and hasattr(challenged, "guild_permissions"):
-                overwrites[challenged] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-
-            channel_name = f"challenge-{challenger_name}-vs-{challenged_name}"
-            channel_name = ''.join(c if c.isalnum() or c in '-_' else '-' for c in channel_name.lower())[:100]
-
-            private_channel = await guild.create_text_channel(
-                name=channel_name,
-                overwrites=overwrites,
-                reason="Challenge accepted - private battle channel"
+            async def timed(phase, awaitable):
+                phase_started = time.perf_counter()
+                try:
+                    return await awaitable
+                finally:
+                    timings[phase] = (time.perf_counter() - phase_started) * 1000
+
+            # Acknowledge right away; setup below can outlast the 3-second interaction deadline
+            await timed('defer', interaction.response.defer())
+
+            async def provision_channel():
+                challenger, challenged = await timed('members', asyncio.gather(
+                    get_member_safely(guild, self.challenger_id),
+                    get_member_safely(guild, self.challenged_id)
+                ))
+                challenger_name = display_name_of(challenger, self.challenger_id)
+                challenged_name = display_name_of(challenged, self.challenged_id)
+
+                members = [member for member in (challenger, challenged)
+                           if member and hasattr(member, "guild_permissions")]
+
+                channel_name = f"challenge-{challenger_name}-vs-{challenged_name}"
+                channel_name = ''.join(c if c.isalnum() or c in '-_' else '-' for c in channel_name.lower())[:100]
+
+                private_channel = await timed('room', room_provider.acquire(guild, channel_name, members))
+                return challenger_name, challenged_name, private_channel
+
+            # Room setup and webhook provisioning don't depend on each other
+            (challenger_name, challenged_name, private_channel), challenger_webhook, challenged_webhook = await asyncio.gather(
+                provision_channel(),
+                timed('challenger_webhook', get_or_create_persistent_webhook(self.challenger_id, guild)),
+                timed('challenged_webhook', get_or_create_persistent_webhook(self.challenged_id, guild))
             )
 
-            challenger_webhook = await get_or_create_persistent_webhook(self.challenger_id, guild)
-            challenged_webhook = await get_or_create_persistent_webhook(self.challenged_id, guild)
-
-            challenge = Challenge(self.challenger_id, self.challenged_id, self.challenge_type, self.qbank_code, self.main_channel_id)
+            challenge = Challenge(self.challenger_id, self.challenged_id, self.challenge_type, self.qbank_code, self.main_channel_id, guild.id)
             challenge.private_channel_id = private_channel.id
             challenge.add_player(self.challenger_id, challenger_name)
             challenge.add_player(self.challenged_id, challenged_name)
@@ -569,6 +1988,7 @@ class ChallengeView(discord.ui.View):
             challenge_channels[private_channel.id] = challenge
             user_active_challenges[self.challenger_id] = private_channel.id
             user_active_challenges[self.challenged_id] = private_channel.id
+            state_snapshotter.mark('challenge', private_channel.id)
 
             config = CHALLENGE_TYPES[self.challenge_type]
             marrow_link = f"https://link.marrow.com/join_custom_module/{self.qbank_code}"
@@ -576,11 +1996,12 @@ class ChallengeView(discord.ui.View):
             description = (
                 f"**{challenger_name}** vs **{challenged_name}**\n\n"
                 f"**Question Bank Code:** `{self.qbank_code}`\n"
-                f"**Scoring:** +{config['correct_points']} correct, {config['wrong_points']} wrong\n"
+                f"**Scoring:** +{config['correct_points']} correct, {config['wrong_points']} wrong{speed_bonus_text(config)}\n"
                 f"{'**Time Limit:** ' + str(config['time_limit']) + 's per question' if config['time_limit'] else '**Time Limit:** None'}\n\n"
                 "**How to play:**\n"
                 "• Use the Marrow link below to access questions\n"
                 "• Mark answers with: `Y/C/+` (correct) or `N/W/-` (wrong)\n"
+                "• Catching up? Send several at once: `Y Y N Y N`, `Y x5` or `+ + -`\n"
                 "• **Shortcuts will automatically relay here**\n"
                 "• Type `!endchallenge` when finished\n\n"
                 f"**[Join Question Bank]({marrow_link})**"
@@ -592,7 +2013,6 @@ class ChallengeView(discord.ui.View):
                 color=0x00ff00
             )
             embed.set_footer(text="Good luck! May the best player win!")
-            await private_channel.send(embed=embed)
 
             webhook_embed = discord.Embed(
                 title="Your Persistent Shortcuts Webhooks",
@@ -626,21 +2046,30 @@ class ChallengeView(discord.ui.View):
                 inline=False
             )
 
-            await private_channel.send(embed=webhook_embed)
-
             success_embed = discord.Embed(
                 title="Challenge Accepted!",
                 description=f"**{challenged_name}** accepted the challenge!\nHead to {private_channel.mention} to begin!",
                 color=0x00ff00
             )
-            await interaction.response.edit_message(embed=success_embed, view=None)
+            await timed('announce', asyncio.gather(
+                outbound.send(private_channel, PRIORITY_COMMAND, embeds=[embed, webhook_embed]),
+                interaction.edit_original_response(embed=success_embed, view=None)
+            ))
+
+            if challenge.live_scoreboard:
+                await timed('scoreboard', start_live_scoreboard(challenge, private_channel))
 
             # Start timer if needed
             if config['time_limit']:
-                asyncio.create_task(start_challenge_timer(private_channel.id, config['time_limit']))
+                await timed('timer', start_challenge_timer(private_channel.id, config['time_limit']))
 
-        except Exception as e:
-            print(f"Error in accept_challenge: {e}")
+            total = (time.perf_counter() - started) * 1000
+            breakdown = ' '.join(f"{phase}={elapsed:.0f}ms" for phase, elapsed in timings.items())
+            log.info("Challenge accepted in %.0fms: %s", total, breakdown)
+
+        except Exception:
+            log.exception("Error in accept_challenge")
+            self.accepted = False
             try:
                 await interaction.response.send_message("An error occurred while setting up the challenge. Please try again.", ephemeral=True)
             except Exception:
@@ -651,6 +2080,7 @@ class ChallengeView(discord.ui.View):
 
     @discord.ui.button(label='Decline Challenge', style=discord.ButtonStyle.danger)
     async def decline_challenge(self, interaction: discord.Interaction, button: discord.ui.Button):
+        bind_interaction_log_context(interaction, 'decline_challenge')
         try:
             if interaction.user.id != self.challenged_id:
                 await interaction.response.send_message("Only the challenged player can decline this challenge!", ephemeral=True)
@@ -659,8 +2089,8 @@ class ChallengeView(discord.ui.View):
             guild = interaction.guild
             challenger = await get_member_safely(guild, self.challenger_id)
             challenged = await get_member_safely(guild, self.challenged_id)
-            challenger_name = challenger.display_name if hasattr(challenger, "display_name") else challenger.name if challenger else f"User{self.challenger_id}"
-            challenged_name = challenged.display_name if hasattr(challenged, "display_name") else challenged.name if challenged else f"User{self.challenged_id}"
+            challenger_name = display_name_of(challenger, self.challenger_id)
+            challenged_name = display_name_of(challenged, self.challenged_id)
 
             decline_embed = discord.Embed(
                 title="Challenge Declined",
@@ -669,8 +2099,8 @@ class ChallengeView(discord.ui.View):
             )
             await interaction.response.edit_message(embed=decline_embed, view=None)
 
-        except Exception as e:
-            print(f"Error in decline_challenge: {e}")
+        except Exception:
+            log.exception("Error in decline_challenge")
             try:
                 await interaction.response.send_message("An error occurred.", ephemeral=True)
             except Exception:
@@ -680,231 +2110,852 @@ class ChallengeView(discord.ui.View):
                     pass
 
 # Database functions
-async def init_db():
-    try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS game_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    username TEXT,
-                    channel_id INTEGER,
-                    score INTEGER,
-                    streak INTEGER,
-                    game_mode TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS challenge_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    challenger_id INTEGER,
-                    challenged_id INTEGER,
-                    winner_id INTEGER,
-                    challenge_type TEXT,
-                    qbank_code TEXT,
-                    challenger_correct INTEGER,
-                    challenger_wrong INTEGER,
-                    challenger_points INTEGER,
-                    challenged_correct INTEGER,
-                    challenged_wrong INTEGER,
-                    challenged_points INTEGER,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS persistent_webhooks (
-                    user_id INTEGER,
-                    guild_id INTEGER,
-                    webhook_id INTEGER,
-                    webhook_url TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (user_id, guild_id)
-                )
-            """)
+class DatabaseManager:
+    """Owns the bot's long-lived SQLite connections: one writer, one reader"""
+
+    WRITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",
+        "PRAGMA busy_timeout=5000",
+    )
+    READ_PRAGMAS = (
+        "PRAGMA query_only=ON",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+        self.reader = None
+        self.write_lock = asyncio.Lock()
+
+    @property
+    def is_open(self):
+        return self.writer is not None
+
+    async def open(self):
+        if self.is_open:
+            return
+        self.writer = await aiosqlite.connect(self.path)
+        for pragma in self.WRITE_PRAGMAS:
+            await self.writer.execute(pragma)
+        await self.writer.commit()
+        # WAL lets the reader see committed rows without blocking the writer
+        self.reader = await aiosqlite.connect(self.path)
+        for pragma in self.READ_PRAGMAS:
+            await self.reader.execute(pragma)
+        log.info("Opened database %s", self.path)
+
+    async def close(self):
+        if not self.is_open:
+            return
+        async with self.write_lock:
+            try:
+                await self.writer.execute("PRAGMA optimize")
+                await self.writer.commit()
+            finally:
+                await self.reader.close()
+                await self.writer.close()
+                self.reader = None
+                self.writer = None
+        log.info("Closed database %s", self.path)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """Serialize writers and commit (or roll back) as a single unit"""
+        async with self.write_lock:
+            with db_write_latency.time():
+                try:
+                    yield self.writer
+                    await self.writer.commit()
+                except Exception:
+                    await self.writer.rollback()
+                    raise
+
+    async def fetchone(self, query, params=()):
+        async with self.reader.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def fetchall(self, query, params=()):
+        async with self.reader.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+class WriteBehindQueue:
+    """Buffers inserts and commits them in groups on the shared writer connection"""
+
+    def __init__(self, manager, batch_size=WRITE_BATCH_SIZE, flush_interval_ms=WRITE_FLUSH_INTERVAL_MS):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue = asyncio.Queue()
+        self.worker_task = None
+        self.records_written = 0
+        self.records_failed = 0
+        self.batches_committed = 0
+
+    @property
+    def depth(self):
+        return self.queue.qsize()
+
+    def enqueue(self, query, params):
+        self.queue.put_nowait((query, params))
+
+    def start(self):
+        if self.worker_task is None or self.worker_task.done():
+            self.worker_task = asyncio.create_task(self._run())
+
+    async def flush(self):
+        """Wait until everything enqueued so far is committed"""
+        if self.worker_task is None or self.worker_task.done():
+            return
+        await self.queue.join()
 
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS server_logging_channels (
-                    guild_id INTEGER PRIMARY KEY,
-                    channel_id INTEGER,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+    async def stop(self):
+        if self.worker_task is None:
+            return
+        pending = self.depth
+        await self.flush()
+        self.worker_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.worker_task
+        self.worker_task = None
+        log.info("Write-behind queue stopped (%s pending record(s) flushed, %s written)", pending, self.records_written)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._commit(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
 
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS mono_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    creator_id INTEGER,
-                    qbank_code TEXT,
-                    channel_id INTEGER,
-                    title TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+    async def _commit(self, batch):
+        try:
+            async with self.manager.transaction() as db:
+                # Consecutive records for the same statement go out as one executemany
+                for query, group in itertools.groupby(batch, key=lambda record: record[0]):
+                    await db.executemany(query, [params for _, params in group])
+            self.records_written += len(batch)
+            self.batches_committed += 1
+        except Exception:
+            log.exception("Error committing write batch of %s, retrying individually", len(batch))
+            await self._commit_individually(batch)
 
+    async def _commit_individually(self, batch):
+        for query, params in batch:
+            try:
+                async with self.manager.transaction() as db:
+                    await db.execute(query, params)
+                self.records_written += 1
+            except Exception as e:
+                self.records_failed += 1
+                log.error("Dropping write that failed to commit: %s", e)
+
+class StateSnapshotter:
+    """Mirrors in-progress challenges, mono sessions and games into active_state.
+
+    Mutations only mark an entry dirty; dirty entries are serialized at most
+    once per interval and written through the write-behind queue.
+    """
+
+    def __init__(self, queue, interval=STATE_SNAPSHOT_INTERVAL):
+        self.queue = queue
+        self.interval = interval
+        self.dirty = set()  # (kind, channel_id)
+        self.task = None
+
+    @staticmethod
+    def registries():
+        return {
+            'challenge': challenge_channels,
+            'mono': mono_sessions,
+            'game': active_games,
+        }
+
+    def mark(self, kind, channel_id):
+        self.dirty.add((kind, channel_id))
+
+    def forget(self, kind, channel_id):
+        self.dirty.discard((kind, channel_id))
+        self.queue.enqueue("DELETE FROM active_state WHERE kind = ? AND channel_id = ?", (kind, channel_id))
+
+    def flush(self):
+        dirty, self.dirty = self.dirty, set()
+        registries = self.registries()
+        for kind, channel_id in dirty:
+            obj = registries[kind].get(channel_id)
+            if obj is None:
+                continue
+            try:
+                self.queue.enqueue("""
+                    INSERT OR REPLACE INTO active_state (kind, channel_id, state, updated_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """, (kind, channel_id, json.dumps(obj.to_state())))
+            except Exception:
+                log.exception("Error snapshotting %s %s", kind, channel_id)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.dirty:
+                self.flush()
+
+db_manager = DatabaseManager(DB_PATH)
+write_queue = WriteBehindQueue(db_manager)
+state_snapshotter = StateSnapshotter(write_queue)
+
+# Schema migrations: (version, description, statements), applied in order at startup.
+# Never edit a released migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Initial schema", [
+        """
+        CREATE TABLE IF NOT EXISTS game_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            username TEXT,
+            channel_id INTEGER,
+            score INTEGER,
+            streak INTEGER,
+            game_mode TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS challenge_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            challenger_id INTEGER,
+            challenged_id INTEGER,
+            winner_id INTEGER,
+            challenge_type TEXT,
+            qbank_code TEXT,
+            challenger_correct INTEGER,
+            challenger_wrong INTEGER,
+            challenger_points INTEGER,
+            challenged_correct INTEGER,
+            challenged_wrong INTEGER,
+            challenged_points INTEGER,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS persistent_webhooks (
+            user_id INTEGER,
+            guild_id INTEGER,
+            webhook_id INTEGER,
+            webhook_url TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, guild_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS server_logging_channels (
+            guild_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS mono_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            creator_id INTEGER,
+            qbank_code TEXT,
+            channel_id INTEGER,
+            title TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS mono_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            user_id INTEGER,
+            username TEXT,
+            score INTEGER,
+            correct_count INTEGER,
+            total_questions INTEGER,
+            percentage REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES mono_sessions (id)
+        )
+        """,
+    ]),
+    (2, "Indexes for per-user and per-session stats queries", [
+        "CREATE INDEX IF NOT EXISTS idx_mono_scores_session_user ON mono_scores (session_id, user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_mono_scores_user ON mono_scores (user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_mono_sessions_channel ON mono_sessions (channel_id)",
+        "CREATE INDEX IF NOT EXISTS idx_challenge_stats_challenger ON challenge_stats (challenger_id)",
+        "CREATE INDEX IF NOT EXISTS idx_challenge_stats_challenged ON challenge_stats (challenged_id)",
+        "CREATE INDEX IF NOT EXISTS idx_game_stats_user ON game_stats (user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_persistent_webhooks_webhook ON persistent_webhooks (webhook_id)",
+    ]),
+    (3, "Snapshots of in-progress challenges, mono sessions and games", [
+        """
+        CREATE TABLE IF NOT EXISTS active_state (
+            kind TEXT,
+            channel_id INTEGER,
+            state TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (kind, channel_id)
+        )
+        """,
+    ]),
+    (4, "Per-guild leaderboard aggregates", [
+        "ALTER TABLE challenge_stats ADD COLUMN guild_id INTEGER",
+        "ALTER TABLE mono_sessions ADD COLUMN guild_id INTEGER",
+        """
+        CREATE TABLE IF NOT EXISTS leaderboard_daily (
+            guild_id INTEGER,
+            day TEXT,
+            user_id INTEGER,
+            username TEXT,
+            points INTEGER DEFAULT 0,
+            correct INTEGER DEFAULT 0,
+            wrong INTEGER DEFAULT 0,
+            challenges INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            mono_quizzes INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, day, user_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS leaderboard_totals (
+            guild_id INTEGER,
+            user_id INTEGER,
+            username TEXT,
+            points INTEGER DEFAULT 0,
+            correct INTEGER DEFAULT 0,
+            wrong INTEGER DEFAULT 0,
+            challenges INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            mono_quizzes INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_leaderboard_totals_points ON leaderboard_totals (guild_id, points DESC)",
+    ]),
+    (5, "Bot metadata and per-guild announcement history", [
+        """
+        CREATE TABLE IF NOT EXISTS bot_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS guild_announcements (
+            guild_id INTEGER PRIMARY KEY,
+            announced_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (6, "HTTP ingest tokens", [
+        """
+        CREATE TABLE IF NOT EXISTS ingest_tokens (
+            user_id INTEGER PRIMARY KEY,
+            token TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (7, "Append-only per-answer event log", [
+        "ALTER TABLE challenge_stats ADD COLUMN challenge_id TEXT",
+        """
+        CREATE TABLE IF NOT EXISTS answer_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            challenge_id TEXT,
+            guild_id INTEGER,
+            channel_id INTEGER,
+            user_id INTEGER,
+            verdict TEXT,
+            source TEXT,
+            message_id INTEGER,
+            message_at REAL,
+            ingest_latency_ms REAL,
+            recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_answer_events_challenge ON answer_events (challenge_id, message_at)",
+        "CREATE INDEX IF NOT EXISTS idx_answer_events_user ON answer_events (user_id, message_at)",
+        "CREATE INDEX IF NOT EXISTS idx_challenge_stats_challenge ON challenge_stats (challenge_id)",
+    ]),
+    (8, "Pending challenge channel deletions", [
+        """
+        CREATE TABLE IF NOT EXISTS channel_deletions (
+            channel_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            reason TEXT,
+            due_at REAL,
+            attempts INTEGER DEFAULT 0,
+            last_error TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (9, "Pooled challenge rooms", [
+        "ALTER TABLE channel_deletions ADD COLUMN action TEXT DEFAULT 'delete'",
+        """
+        CREATE TABLE IF NOT EXISTS challenge_rooms (
+            channel_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            in_use INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (10, "Challenge start times for replaying speed bonuses", [
+        "ALTER TABLE challenge_stats ADD COLUMN started_at REAL",
+    ]),
+]
+
+async def get_schema_version(db):
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    async with db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version") as cursor:
+        row = await cursor.fetchone()
+        return row[0]
+
+async def run_migrations():
+    """Apply every migration newer than the recorded schema version"""
+    async with db_manager.transaction() as db:
+        current_version = await get_schema_version(db)
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+        # Each migration is applied atomically together with its version record
+        async with db_manager.transaction() as db:
+            await db.execute("BEGIN")
+            for statement in statements:
+                await db.execute(statement)
             await db.execute("""
-                CREATE TABLE IF NOT EXISTS mono_scores (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER,
-                    user_id INTEGER,
-                    username TEXT,
-                    score INTEGER,
-                    correct_count INTEGER,
-                    total_questions INTEGER,
-                    percentage REAL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES mono_sessions (id)
-                )
-            """)
+                INSERT INTO schema_version (version, description) VALUES (?, ?)
+            """, (version, description))
+        log.info("Applied schema migration %s: %s", version, description)
 
-            await db.commit()
-    except Exception as e:
-        print(f"Error initializing database: {e}")
+async def init_db():
+    """Bring the database schema up to date"""
+    try:
+        await run_migrations()
+    except Exception:
+        log.exception("Error initializing database")
 
 async def save_game_stats(session):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            for player in session.players.values():
-                await db.execute("""
-                    INSERT INTO game_stats
-                    (user_id, username, channel_id, score, streak, game_mode)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (player.user_id, player.username, session.channel_id,
-                      player.score, player.streak, session.mode))
-            await db.commit()
-    except Exception as e:
-        print(f"Error saving game stats: {e}")
+        for player in session.players.values():
+            write_queue.enqueue("""
+                INSERT INTO game_stats
+                (user_id, username, channel_id, score, streak, game_mode)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (player.user_id, player.username, session.channel_id,
+                  player.score, player.streak, session.mode))
+    except Exception:
+        log.exception("Error saving game stats")
 
 async def save_challenge_stats(challenge):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            players_list = list(challenge.players.values())
-            if len(players_list) >= 2:
-                challenger = players_list[0]
-                challenged = players_list[1]
-                winner = challenge.get_winner()
-                winner_id = winner.user_id if winner else None
-
-                await db.execute("""
-                    INSERT INTO challenge_stats
-                    (challenger_id, challenged_id, winner_id, challenge_type, qbank_code,
-                     challenger_correct, challenger_wrong, challenger_points,
-                     challenged_correct, challenged_wrong, challenged_points)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (challenge.challenger_id, challenge.challenged_id, winner_id,
-                      challenge.challenge_type, challenge.qbank_code,
-                      challenger.correct_count, challenger.wrong_count, challenger.total_points,
-                      challenged.correct_count, challenged.wrong_count, challenged.total_points))
-            await db.commit()
-    except Exception as e:
-        print(f"Error saving challenge stats: {e}")
+        players_list = list(challenge.players.values())
+        if len(players_list) < 2:
+            return
+        challenger = players_list[0]
+        challenged = players_list[1]
+        winner = challenge.get_winner()
+        winner_id = winner.user_id if winner else None
+
+        write_queue.enqueue("""
+            INSERT INTO challenge_stats
+            (challenger_id, challenged_id, winner_id, challenge_type, qbank_code,
+             challenger_correct, challenger_wrong, challenger_points,
+             challenged_correct, challenged_wrong, challenged_points, guild_id, challenge_id, started_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (challenge.challenger_id, challenge.challenged_id, winner_id,
+              challenge.challenge_type, challenge.qbank_code,
+              challenger.correct_count, challenger.wrong_count, challenger.total_points,
+              challenged.correct_count, challenged.wrong_count, challenged.total_points,
+              challenge.guild_id, challenge.challenge_id, challenge.started_at))
+
+        if challenge.guild_id:
+            for player in players_list[:2]:
+                record_leaderboard_delta(
+                    challenge.guild_id, player.user_id, player.username,
+                    points=player.total_points, correct=player.correct_count, wrong=player.wrong_count,
+                    challenges=1, wins=1 if player.user_id == winner_id else 0
+                )
+    except Exception:
+        log.exception("Error saving challenge stats")
 
 async def save_user_webhook_to_db(user_id, guild_id, webhook_id, webhook_url):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with db_manager.transaction() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO persistent_webhooks
                 (user_id, guild_id, webhook_id, webhook_url)
                 VALUES (?, ?, ?, ?)
             """, (user_id, guild_id, webhook_id, webhook_url))
-            await db.commit()
-    except Exception as e:
-        print(f"Error saving webhook to db: {e}")
+    except Exception:
+        log.exception("Error saving webhook to db")
 
 async def get_user_webhook_from_db(user_id, guild_id):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute("""
-                SELECT webhook_id, webhook_url FROM persistent_webhooks
-                WHERE user_id = ? AND guild_id = ?
-            """, (user_id, guild_id)) as cursor:
-                row = await cursor.fetchone()
-                return row if row else None
-    except Exception as e:
-        print(f"Error getting webhook from db: {e}")
+        return await db_manager.fetchone("""
+            SELECT webhook_id, webhook_url FROM persistent_webhooks
+            WHERE user_id = ? AND guild_id = ?
+        """, (user_id, guild_id))
+    except Exception:
+        log.exception("Error getting webhook from db")
         return None
 
 async def remove_user_webhook_from_db(user_id, guild_id):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with db_manager.transaction() as db:
             await db.execute("""
                 DELETE FROM persistent_webhooks
                 WHERE user_id = ? AND guild_id = ?
             """, (user_id, guild_id))
-            await db.commit()
-    except Exception as e:
-        print(f"Error removing webhook from db: {e}")
+    except Exception:
+        log.exception("Error removing webhook from db")
 
 async def save_logging_channel(guild_id, channel_id):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
+        register_logging_channel(guild_id, channel_id)
+        async with db_manager.transaction() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO server_logging_channels
                 (guild_id, channel_id)
                 VALUES (?, ?)
             """, (guild_id, channel_id))
-            await db.commit()
-    except Exception as e:
-        print(f"Error saving logging channel: {e}")
+    except Exception:
+        log.exception("Error saving logging channel")
 
 async def save_mono_session(session):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with db_manager.transaction() as db:
             cursor = await db.execute("""
-                INSERT INTO mono_sessions (creator_id, qbank_code, channel_id, title)
-                VALUES (?, ?, ?, ?)
-            """, (session.creator_id, session.qbank_code, session.channel_id, session.title))
-            session_id = cursor.lastrowid
-            await db.commit()
-            return session_id
-    except Exception as e:
-        print(f"Error saving mono session: {e}")
+                INSERT INTO mono_sessions (creator_id, qbank_code, channel_id, title, guild_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, (session.creator_id, session.qbank_code, session.channel_id, session.title, session.guild_id))
+            return cursor.lastrowid
+    except Exception:
+        log.exception("Error saving mono session")
         return None
 
 async def save_mono_score(session_id, user_id, username, score, correct_count, total_questions, percentage):
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
+        write_queue.enqueue("""
+            INSERT INTO mono_scores (session_id, user_id, username, score, correct_count, total_questions, percentage)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (session_id, user_id, username, score, correct_count, total_questions, percentage))
+    except Exception:
+        log.exception("Error saving mono score")
+
+def record_answer_events(challenge, user_id, answers, source, snowflake):
+    """Append one answer_events row per verdict; message_at comes from the snowflake"""
+    message_at = discord.utils.snowflake_time(snowflake).timestamp()
+    latency_ms = max(0.0, (time.time() - message_at) * 1000)
+    message_id = snowflake if source != 'http' else None
+    for answer in answers:
+        write_queue.enqueue("""
+            INSERT INTO answer_events
+            (challenge_id, guild_id, channel_id, user_id, verdict, source, message_id, message_at, ingest_latency_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (challenge.challenge_id, challenge.guild_id, challenge.private_channel_id, user_id,
+              answer, source, message_id, message_at, latency_ms))
+
+async def replay_challenge_events(challenge_id, guild_id=None):
+    """Rebuild a challenge's per-player totals from its answer events.
+
+    Points are recomputed with the current CHALLENGE_TYPES rules, so this also
+    re-scores old challenges after a rule change. Returns (challenge_type, players)
+    or None if the challenge is unknown.
+    """
+    await write_queue.flush()
+    row = await db_manager.fetchone("""
+        SELECT challenge_type, guild_id, started_at FROM challenge_stats WHERE challenge_id = ?
+    """, (challenge_id,))
+    if not row or (guild_id and row[1] != guild_id) or row[0] not in CHALLENGE_TYPES:
+        return None
+    challenge_type, _, started_at = row
+    config = CHALLENGE_TYPES[challenge_type]
+
+    rows = await db_manager.fetchall("""
+        SELECT user_id, message_at, verdict FROM answer_events
+        WHERE challenge_id = ?
+        ORDER BY message_at, id
+    """, (challenge_id,))
+    players = {}
+    trackers = defaultdict(lambda: PaceTracker(started_at))
+    # A message's answers are logged together, so consecutive rows sharing (user, time) are one batch
+    for (user_id, message_at), batch in itertools.groupby(rows, key=lambda row: row[:2]):
+        player = players.setdefault(user_id, ChallengePlayer(user_id, None))
+        apply_challenge_answers(player, trackers[user_id], config, [row[2] for row in batch], message_at)
+    return challenge_type, players
+
+async def get_pace_history(user_id, guild_id):
+    """A player's per-answer gaps across every logged challenge in a guild, sorted, with weights.
+
+    Gaps are computed in SQLite with a window function; batch messages contribute
+    one gap per answer via the weight column.
+    """
+    await write_queue.flush()
+    return await db_manager.fetchall("""
+        WITH messages AS (
+            SELECT challenge_id, message_at, COUNT(*) AS answers
+            FROM answer_events
+            WHERE user_id = ? AND guild_id = ?
+            GROUP BY challenge_id, message_at
+        ), gaps AS (
+            SELECT (message_at - LAG(message_at) OVER (PARTITION BY challenge_id ORDER BY message_at)) / answers AS gap,
+                   answers
+            FROM messages
+        )
+        SELECT gap, answers FROM gaps WHERE gap IS NOT NULL ORDER BY gap
+    """, (user_id, guild_id))
+
+def weighted_quantile(sorted_rows, q):
+    """Quantile of (value, weight) rows already sorted by value"""
+    if not sorted_rows:
+        return None
+    cumulative = list(itertools.accumulate(weight for _, weight in sorted_rows))
+    target = max(1, math.ceil(q * cumulative[-1]))
+    return sorted_rows[bisect.bisect_left(cumulative, target)][0]
+
+LEADERBOARD_UPSERT_COLUMNS = ('points', 'correct', 'wrong', 'challenges', 'wins', 'mono_quizzes')
+
+def record_leaderboard_delta(guild_id, user_id, username, **deltas):
+    """Fold a score change into the daily and all-time leaderboard aggregates"""
+    values = tuple(deltas.get(column, 0) for column in LEADERBOARD_UPSERT_COLUMNS)
+    increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in LEADERBOARD_UPSERT_COLUMNS)
+    day = datetime.now(timezone.utc).date().isoformat()
+    write_queue.enqueue(f"""
+        INSERT INTO leaderboard_daily (guild_id, day, user_id, username, {", ".join(LEADERBOARD_UPSERT_COLUMNS)})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (guild_id, day, user_id) DO UPDATE SET username = excluded.username, {increments}
+    """, (guild_id, day, user_id, username, *values))
+    write_queue.enqueue(f"""
+        INSERT INTO leaderboard_totals (guild_id, user_id, username, {", ".join(LEADERBOARD_UPSERT_COLUMNS)})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (guild_id, user_id) DO UPDATE SET username = excluded.username, {increments}
+    """, (guild_id, user_id, username, *values))
+
+async def get_server_leaderboard(guild_id, days=None, limit=SERVER_LEADERBOARD_SIZE):
+    """Top users for a guild, over the last `days` days or all time"""
+    try:
+        if days is None:
+            return await db_manager.fetchall("""
+                SELECT user_id, username, points, correct, wrong, challenges, wins, mono_quizzes
+                FROM leaderboard_totals
+                WHERE guild_id = ?
+                ORDER BY points DESC
+                LIMIT ?
+            """, (guild_id, limit))
+
+        since = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+        # leaderboard_totals holds the name from each user's latest update
+        return await db_manager.fetchall("""
+            SELECT d.user_id, COALESCE(t.username, MAX(d.username)), SUM(d.points) AS total_points,
+                   SUM(d.correct), SUM(d.wrong), SUM(d.challenges), SUM(d.wins), SUM(d.mono_quizzes)
+            FROM leaderboard_daily d
+            LEFT JOIN leaderboard_totals t ON t.guild_id = d.guild_id AND t.user_id = d.user_id
+            WHERE d.guild_id = ? AND d.day >= ?
+            GROUP BY d.user_id
+            ORDER BY total_points DESC
+            LIMIT ?
+        """, (guild_id, since, limit))
+    except Exception:
+        log.exception("Error getting server leaderboard")
+        return []
+
+async def save_ingest_token_to_db(user_id, token):
+    try:
+        async with db_manager.transaction() as db:
             await db.execute("""
-                INSERT INTO mono_scores (session_id, user_id, username, score, correct_count, total_questions, percentage)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (session_id, user_id, username, score, correct_count, total_questions, percentage))
-            await db.commit()
-    except Exception as e:
-        print(f"Error saving mono score: {e}")
+                INSERT OR REPLACE INTO ingest_tokens (user_id, token) VALUES (?, ?)
+            """, (user_id, token))
+    except Exception:
+        log.exception("Error saving ingest token to db")
+
+async def get_bot_meta(key):
+    try:
+        row = await db_manager.fetchone("SELECT value FROM bot_meta WHERE key = ?", (key,))
+        return row[0] if row else None
+    except Exception:
+        log.exception("Error reading bot metadata %s", key)
+        return None
+
+async def set_bot_meta(key, value):
+    try:
+        async with db_manager.transaction() as db:
+            await db.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES (?, ?)", (key, value))
+    except Exception:
+        log.exception("Error saving bot metadata %s", key)
+
+def record_guild_announcement(guild_id):
+    write_queue.enqueue("""
+        INSERT OR REPLACE INTO guild_announcements (guild_id, announced_at)
+        VALUES (?, CURRENT_TIMESTAMP)
+    """, (guild_id,))
+
+async def get_recent_guild_announcements(hours):
+    """IDs of guilds that were sent a welcome/startup message within the last `hours`"""
+    try:
+        rows = await db_manager.fetchall("""
+            SELECT guild_id FROM guild_announcements
+            WHERE announced_at >= datetime('now', ?)
+        """, (f"-{hours} hours",))
+        return {row[0] for row in rows}
+    except Exception:
+        log.exception("Error reading guild announcements")
+        return set()
 
 async def load_persistent_data():
     """Load persistent webhooks and logging channels from database on startup"""
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Load webhook mappings
-            async with db.execute('SELECT webhook_id, user_id FROM persistent_webhooks') as cursor:
-                async for row in cursor:
-                    webhook_user_mappings[row[0]] = row[1]
-
-            # Load logging channels
-            async with db.execute('SELECT guild_id, channel_id FROM server_logging_channels') as cursor:
-                async for row in cursor:
-                    server_logging_channels[row[0]] = row[1]
-    except Exception as e:
-        print(f"Error loading persistent data: {e}")
+        # Load webhook mappings
+        for webhook_id, user_id in await db_manager.fetchall('SELECT webhook_id, user_id FROM persistent_webhooks'):
+            webhook_user_mappings[webhook_id] = user_id
+
+        # Load logging channels
+        for guild_id, channel_id in await db_manager.fetchall('SELECT guild_id, channel_id FROM server_logging_channels'):
+            register_logging_channel(guild_id, channel_id)
+
+        # Load HTTP ingest tokens
+        for user_id, token in await db_manager.fetchall('SELECT user_id, token FROM ingest_tokens'):
+            ingest_token_mappings[token] = user_id
+    except Exception:
+        log.exception("Error loading persistent data")
+
+def restore_challenge(challenge, channel):
+    challenge_channels[channel.id] = challenge
+    active_challenges[channel.id] = challenge
+    for user_id in challenge.players:
+        user_active_challenges[user_id] = channel.id
+
+async def restore_game_state():
+    """Rebuild in-progress challenges, mono sessions and games saved before a restart"""
+    restored = {'challenge': 0, 'mono': 0, 'game': 0}
+    try:
+        rows = await db_manager.fetchall('SELECT kind, channel_id, state FROM active_state')
+    except Exception:
+        log.exception("Error loading saved game state")
+        return
+
+    for kind, channel_id, state in rows:
+        try:
+            channel = bot.get_channel(channel_id)
+            if not channel:
+                # Channel is gone, nothing to re-attach to
+                state_snapshotter.forget(kind, channel_id)
+                continue
+
+            state = json.loads(state)
+            if kind == 'challenge':
+                challenge = Challenge.from_state(state)
+                restore_challenge(challenge, channel)
+                if challenge.live_scoreboard and state['scoreboard_message_id']:
+                    scoreboard = LiveScoreboard(challenge, channel)
+                    scoreboard.message = channel.get_partial_message(state['scoreboard_message_id'])
+                    challenge.scoreboard = scoreboard
+                await outbound.send(channel, PRIORITY_ANNOUNCEMENT,
+                                    content="Harrow restarted - this challenge has been restored and scores so far are kept.")
+                if challenge.config['time_limit']:
+                    await start_challenge_timer(channel.id, challenge.config['time_limit'])
+            elif kind == 'mono':
+                mono_sessions[channel_id] = MonoSession.from_state(state)
+            elif kind == 'game':
+                active_games[channel_id] = GameSession.from_state(state)
+            else:
+                continue
+            restored[kind] += 1
+        except Exception:
+            log.exception("Error restoring %s in channel %s", kind, channel_id)
+
+    log.info("Restored %s challenge(s), %s mono session(s), %s game(s)", restored['challenge'], restored['mono'], restored['game'])
 
 # Bot events
+def compute_command_tree_hash():
+    payload = []
+    for command in bot.tree.get_commands():
+        try:
+            payload.append(command.to_dict(bot.tree))
+        except TypeError:
+            # discord.py < 2.4 takes no tree argument
+            payload.append(command.to_dict())
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_command_tree():
+    """Sync application commands only when their definitions changed since the last sync"""
+    try:
+        tree_hash = compute_command_tree_hash()
+        if tree_hash == await get_bot_meta('command_tree_hash'):
+            log.info("Command tree unchanged, skipping sync")
+            return
+        synced = await bot.tree.sync()
+        await set_bot_meta('command_tree_hash', tree_hash)
+        log.info("Synced %s command(s)", len(synced))
+    except Exception as e:
+        log.error("Failed to sync commands: %s", e)
+
+startup_complete = False
+
 @bot.event
 async def on_ready():
-    print(f'{bot.user} has connected to Discord!')
-    await init_db()
-    await load_persistent_data()
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        print(f"Failed to sync commands: {e}")
-    
-    # Send welcome message to all guilds on startup
+    global startup_complete
+    log.info("%s has connected to Discord!", bot.user)
+    # on_ready fires again after gateway reconnects; in-memory state is still intact then
+    if startup_complete:
+        return
+    startup_complete = True
+
+    await restore_game_state()
+    await room_provider.reconcile()
+    await sync_command_tree()
+    await warm_webhook_cache()
+
+    # Send welcome message to guilds that haven't heard from us recently
     await send_welcome_message_to_all_guilds()
 
+@bot.event
+async def on_webhooks_update(channel):
+    webhook_cache.invalidate_channel(channel.id)
+
+@bot.event
+async def on_member_update(before, after):
+    member_cache.invalidate(after.guild.id, after.id)
+
+@bot.event
+async def on_member_remove(member):
+    member_cache.invalidate(member.guild.id, member.id)
+
 @bot.event
 async def on_guild_join(guild):
     """Send introduction message when bot joins a server"""
@@ -912,74 +2963,81 @@ async def on_guild_join(guild):
 
 @bot.event
 async def on_message(message):
+    start = time.perf_counter()
+    path = 'error'
     try:
-        # Prevent duplicate message relay and command processing
-        if message.author.bot and not message.webhook_id:
-            return
-
-        # Ensure only process each webhook message once
-        is_logging = message.webhook_id and message.channel.id in server_logging_channels.values()
-        is_challenge_channel = message.channel.id in challenge_channels
-
-        if is_logging and not is_challenge_channel:
-            user_id = get_user_from_webhook_message(message)
-            if user_id:
-                answer = extract_answer_from_content(message.content)
-                if answer:
-                    await relay_message_to_challenge_channels(user_id, answer, message)
-            return
-
-        # Only process direct user input in challenge channel
-        if is_challenge_channel:
-            challenge = challenge_channels[message.channel.id]
-            if not challenge.is_active:
-                return
-
-            user_id = message.author.id if not message.webhook_id else get_user_from_webhook_message(message)
-            if not user_id or user_id not in challenge.players:
-                return
-
-            answer = extract_answer_from_content(message.content)
-            if not answer:
-                return
-
-            player = challenge.players[user_id]
-            try:
-                guild_member = await get_member_safely(message.guild, user_id)
-                display_name = guild_member.display_name if hasattr(guild_member, 'display_name') else guild_member.name if guild_member else f"User{user_id}"
-            except Exception:
-                display_name = f"User{user_id}"
-
-            if answer == 'correct':
-                points = challenge.config['correct_points']
-                player.add_correct(points)
-                embed = discord.Embed(
-                    title="Correct!",
-                    description=f"**{display_name}** +{points} points",
-                    color=0x00ff00
-                )
-                embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
-                embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
-                await message.channel.send(embed=embed)
-
-            elif answer == 'wrong':
-                points = challenge.config['wrong_points']
-                player.add_wrong(points)
-                embed = discord.Embed(
-                    title="Wrong!",
-                    description=f"**{display_name}** {points} points",
-                    color=0xff0000
-                )
-                embed.add_field(name="Total Score", value=f"{player.total_points}", inline=True)
-                embed.add_field(name="Correct/Wrong", value=f"{player.correct_count}/{player.wrong_count}", inline=True)
-                await message.channel.send(embed=embed)
-            return
-
-        # Only process commands for normal user messages
-        if not message.webhook_id and not is_challenge_channel:
+        path = await handle_message(message)
+    except Exception:
+        log.exception("Error in on_message")
+    finally:
+        on_message_latency.observe(time.perf_counter() - start, path)
+
+async def handle_message(message):
+    """Route a gateway message; returns which path handled it, for metrics"""
+    bind_log_context(guild_id=message.guild.id if message.guild else None,
+                     channel_id=message.channel.id, user_id=message.author.id)
+    # Prevent duplicate message relay and command processing
+    if message.author.bot and not message.webhook_id:
+        return 'ignored'
+
+    channel_id = message.channel.id
+    is_challenge_channel = channel_id in challenge_channels
+
+    # Drop messages from channels we don't care about before doing any other work
+    if not is_challenge_channel:
+        if message.webhook_id:
+            if channel_id not in logging_channel_ids:
+                return 'ignored'
+        elif not message.content.startswith(COMMAND_PREFIX):
+            return 'ignored'
+
+    # Ensure only process each webhook message once
+    is_logging = message.webhook_id and channel_id in logging_channel_ids
+
+    if is_logging and not is_challenge_channel:
+        user_id = get_user_from_webhook_message(message)
+        if user_id:
+            answers = extract_answers_from_content(message.content)
+            if answers:
+                await relay_message_to_challenge_channels(user_id, answers, message)
+        return 'relay'
+
+    # Only process direct user input in challenge channel
+    if is_challenge_channel:
+        # Commands such as !endchallenge and !scoreboard also work inside challenge channels
+        if not message.webhook_id and message.content.startswith(COMMAND_PREFIX):
             await bot.process_commands(message)
-    except Exception as e:
-        print(f"Error in on_message: {e}")
+            return 'command'
+
+        challenge = challenge_channels[message.channel.id]
+        if not challenge.is_active:
+            return 'ignored'
+
+        user_id = message.author.id if not message.webhook_id else get_user_from_webhook_message(message)
+        if not user_id or user_id not in challenge.players:
+            return 'ignored'
+
+        answers = extract_answers_from_content(message.content)
+        if not answers:
+            return 'chat'
+
+        source = 'webhook' if message.webhook_id else 'direct'
+        await submit_challenge_answer(challenge, user_id, answers, message.channel, message.id, source)
+        return 'answer'
+
+    # Only process commands for normal user messages
+    if not message.webhook_id:
+        await bot.process_commands(message)
+        return 'command'
+    return 'ignored'
+
+def format_mono_rankings(leaderboard):
+    rankings_text = ""
+    for i, participant in enumerate(leaderboard, 1):
+        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+        rankings_text += f"{medal} **{participant.username}** - {participant.percentage:.1f}% "
+        rankings_text += f"({participant.correct_count}/{participant.total_questions}) - {participant.total_score} pts\n"
+    return rankings_text
 
 # Helper function to show mono leaderboard
 async def show_mono_leaderboard(ctx, session):
@@ -988,7 +3046,7 @@ async def show_mono_leaderboard(ctx, session):
         if not session.participants:
             return
 
-        leaderboard = session.get_leaderboard()
+        leaderboard = session.get_leaderboard(MONO_LEADERBOARD_SIZE)
         
         embed = discord.Embed(
             title="Quiz Results Leaderboard",
@@ -996,11 +3054,7 @@ async def show_mono_leaderboard(ctx, session):
             color=0x3498db
         )
 
-        leaderboard_text = ""
-        for i, participant in enumerate(leaderboard, 1):
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            leaderboard_text += f"{medal} **{participant.username}** - {participant.percentage:.1f}% "
-            leaderboard_text += f"({participant.correct_count}/{participant.total_questions}) - {participant.total_score} pts\n"
+        leaderboard_text = format_mono_rankings(leaderboard)
 
         embed.add_field(
             name="Rankings",
@@ -1018,9 +3072,9 @@ async def show_mono_leaderboard(ctx, session):
 
         embed.set_footer(text=f"Total participants: {len(session.participants)}")
 
-        await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in show_mono_leaderboard: {e}")
+        await outbound.send(ctx.channel, PRIORITY_ANNOUNCEMENT, embed=embed)
+    except Exception:
+        log.exception("Error in show_mono_leaderboard")
 
 # Mono session commands
 @bot.command(name='mono')
@@ -1041,13 +3095,18 @@ async def submit_mono_result(ctx, qbank_code: str, correct_answers: int, total_q
                 return
         else:
             display_title = title or f"Quiz Results - {qbank_code}"
-            session = MonoSession(ctx.author.id, qbank_code, ctx.channel.id, display_title)
+            session = MonoSession(ctx.author.id, qbank_code, ctx.channel.id, display_title,
+                                  ctx.guild.id if ctx.guild else None)
             mono_sessions[ctx.channel.id] = session
             session_id = await save_mono_session(session)
             session.db_id = session_id
 
         # Add participant and their result
         participant = session.add_participant(ctx.author.id, ctx.author.display_name)
+        is_resubmission = participant.total_questions > 0
+        previous_score = participant.total_score
+        previous_correct = participant.correct_count
+        previous_wrong = participant.wrong_count
         
         # Calculate score and percentage
         percentage = (correct_answers / total_questions) * 100
@@ -1058,12 +3117,25 @@ async def submit_mono_result(ctx, qbank_code: str, correct_answers: int, total_q
         participant.total_score = score
         participant.total_questions = total_questions
         participant.percentage = percentage
+        session.update_rank(ctx.author.id)
+        session.last_activity = time.time()
+        state_snapshotter.mark('mono', ctx.channel.id)
 
         # Save to database
-        if hasattr(session, 'db_id') and session.db_id:
+        if session.db_id:
             await save_mono_score(session.db_id, ctx.author.id, ctx.author.display_name, 
                                  score, correct_answers, total_questions, percentage)
 
+        # A resubmission replaces the earlier result, so only the difference counts
+        if session.guild_id:
+            record_leaderboard_delta(
+                session.guild_id, ctx.author.id, ctx.author.display_name,
+                points=score - previous_score,
+                correct=correct_answers - previous_correct,
+                wrong=participant.wrong_count - previous_wrong,
+                mono_quizzes=0 if is_resubmission else 1
+            )
+
         marrow_link = f"https://link.marrow.com/join_custom_module/{qbank_code}"
 
         embed = discord.Embed(
@@ -1084,7 +3156,8 @@ async def submit_mono_result(ctx, qbank_code: str, correct_answers: int, total_q
             name="Your Results",
             value=f"**Score:** {score} points\n"
                   f"**Correct:** {correct_answers}/{total_questions}\n"
-                  f"**Percentage:** {percentage:.1f}%",
+                  f"**Percentage:** {percentage:.1f}%\n"
+                  f"**Rank:** {session.get_rank(ctx.author.id)}/{len(session.participants)}",
             inline=True
         )
 
@@ -1101,10 +3174,50 @@ async def submit_mono_result(ctx, qbank_code: str, correct_answers: int, total_q
         if len(session.participants) > 1:
             await show_mono_leaderboard(ctx, session)
 
-    except Exception as e:
-        print(f"Error in submit_mono_result: {e}")
+    except Exception:
+        log.exception("Error in submit_mono_result")
         await ctx.send("An error occurred while submitting your result.")
 
+@bot.command(name='leaderboard')
+async def show_server_leaderboard(ctx, window: str = 'all'):
+    """Show cumulative standings for this server across challenges and mono sessions"""
+    try:
+        if not ctx.guild:
+            await ctx.send("Server leaderboards are only available in servers!")
+            return
+
+        window = window.lower()
+        if window not in LEADERBOARD_WINDOWS:
+            await ctx.send(f"Invalid window! Available windows: {', '.join(LEADERBOARD_WINDOWS.keys())}")
+            return
+
+        label, days = LEADERBOARD_WINDOWS[window]
+        rows = await get_server_leaderboard(ctx.guild.id, days)
+
+        embed = discord.Embed(
+            title=f"Server Leaderboard - {label}",
+            description=f"Cumulative standings for **{ctx.guild.name}**",
+            color=0xffd700
+        )
+
+        rankings_text = ""
+        for i, (user_id, username, points, correct, wrong, challenges, wins, mono_quizzes) in enumerate(rows, 1):
+            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+            username = get_cached_display_name(ctx.guild, user_id, username)
+            rankings_text += f"{medal} **{username}** - {points} pts ({correct}/{correct + wrong} correct)"
+            rankings_text += f" | {wins}W/{challenges} challenges | {mono_quizzes} mono\n"
+
+        embed.add_field(
+            name="Rankings",
+            value=rankings_text if rankings_text else "No results yet",
+            inline=False
+        )
+        embed.set_footer(text="Windows: !leaderboard week | month | all")
+        await ctx.send(embed=embed)
+    except Exception:
+        log.exception("Error in show_server_leaderboard")
+        await ctx.send("An error occurred while showing the leaderboard.")
+
 @bot.command(name='monostats')
 async def show_mono_stats(ctx):
     """Show the current mono session leaderboard"""
@@ -1115,8 +3228,8 @@ async def show_mono_stats(ctx):
 
         session = mono_sessions[ctx.channel.id]
         await show_mono_leaderboard(ctx, session)
-    except Exception as e:
-        print(f"Error in show_mono_stats: {e}")
+    except Exception:
+        log.exception("Error in show_mono_stats")
         await ctx.send("An error occurred while showing stats.")
 
 @bot.command(name='endmono')
@@ -1133,9 +3246,22 @@ async def end_mono_session(ctx):
             await ctx.send("Only the session creator or users with Manage Messages permission can end the session!")
             return
 
+        await finalize_mono_session(session, ctx.channel)
+    except Exception:
+        log.exception("Error in end_mono_session")
+        await ctx.send("An error occurred while ending the mono session.")
+
+async def finalize_mono_session(session, channel, reason=None):
+    """Post final results and drop the session; channel may be None if it no longer exists"""
+    if mono_sessions.get(session.channel_id) is not session:
+        return False
+    del mono_sessions[session.channel_id]
+    state_snapshotter.forget('mono', session.channel_id)
+
+    if channel:
         # Show final results
-        leaderboard = session.get_leaderboard()
-        
+        leaderboard = session.get_leaderboard(MONO_LEADERBOARD_SIZE)
+
         embed = discord.Embed(
             title="Mono Session Ended!",
             description=f"Final results for **{session.title}**\nQuestion Bank: `{session.qbank_code}`",
@@ -1150,11 +3276,7 @@ async def end_mono_session(ctx):
                 inline=False
             )
 
-            results_text = ""
-            for i, participant in enumerate(leaderboard, 1):
-                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                results_text += f"{medal} **{participant.username}** - {participant.percentage:.1f}% "
-                results_text += f"({participant.correct_count}/{participant.total_questions}) - {participant.total_score} pts\n"
+            results_text = format_mono_rankings(leaderboard)
 
             embed.add_field(
                 name="Final Rankings",
@@ -1162,15 +3284,13 @@ async def end_mono_session(ctx):
                 inline=False
             )
 
-        embed.set_footer(text=f"Total participants: {len(session.participants)} | Session duration: {datetime.now() - session.created_at}")
+        if reason:
+            embed.add_field(name="Ended Automatically", value=reason, inline=False)
 
-        await ctx.send(embed=embed)
+        embed.set_footer(text=f"Total participants: {len(session.participants)} | Session duration: {datetime.now() - session.created_at}")
 
-        # Clean up
-        del mono_sessions[ctx.channel.id]
-    except Exception as e:
-        print(f"Error in end_mono_session: {e}")
-        await ctx.send("An error occurred while ending the mono session.")
+        await outbound.send(channel, PRIORITY_COMMAND, embed=embed)
+    return True
 
 # Webhook management commands
 @bot.command(name='getwebhook')
@@ -1227,10 +3347,47 @@ async def get_user_webhook(ctx, member: discord.Member = None):
                 await ctx.send(f"Sent webhook URL to {target_user.display_name}'s DMs!")
         except discord.Forbidden:
             await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in get_user_webhook: {e}")
+    except Exception:
+        log.exception("Error in get_user_webhook")
         await ctx.send("An error occurred while getting the webhook.")
 
+@bot.command(name='gettoken')
+async def get_ingest_token(ctx):
+    """DM a personal token for posting answers directly to the bot's HTTP endpoint"""
+    try:
+        if not ingest_server:
+            await ctx.send("Direct HTTP answers aren't enabled on this bot. Use `!getwebhook` instead.")
+            return
+
+        token = await issue_ingest_token(ctx.author.id)
+
+        embed = discord.Embed(
+            title="Your Direct Shortcuts Token",
+            description="Post answers straight to Harrow - faster than the webhook relay. "
+                        "Running `!gettoken` again revokes this token.",
+            color=0x00ff00
+        )
+        embed.add_field(name="URL", value=f"```{get_ingest_url()}```", inline=False)
+        embed.add_field(name="Header", value=f"```Authorization: Bearer {token}```", inline=False)
+        embed.add_field(
+            name="Shortcuts Setup",
+            value="1. 'Get Contents of URL' with the URL above\n"
+                  "2. Method: POST, add the Authorization header\n"
+                  "3. Request Body: JSON `{\"content\": \"Y\"}` or `{\"content\": \"N\"}`\n"
+                  "4. Your `!getwebhook` URL keeps working as a fallback",
+            inline=False
+        )
+
+        try:
+            await ctx.author.send(embed=embed)
+            if ctx.channel.type != discord.ChannelType.private:
+                await ctx.send(f"Sent your direct answer token to {ctx.author.display_name}'s DMs!")
+        except discord.Forbidden:
+            await ctx.send("I couldn't DM you - please enable DMs from server members and try again.")
+    except Exception:
+        log.exception("Error in get_ingest_token")
+        await ctx.send("An error occurred while creating your token.")
+
 @bot.command(name='createloggingchannel')
 async def create_logging_channel_cmd(ctx):
     """Manually create or recreate the logging channel"""
@@ -1244,8 +3401,8 @@ async def create_logging_channel_cmd(ctx):
             await ctx.send(f"Logging channel ready: {channel.mention}")
         else:
             await ctx.send("Failed to create logging channel. Please check bot permissions.")
-    except Exception as e:
-        print(f"Error in create_logging_channel_cmd: {e}")
+    except Exception:
+        log.exception("Error in create_logging_channel_cmd")
         await ctx.send("An error occurred while creating the logging channel.")
 
 # Challenge commands (enhanced with persistent webhook support)
@@ -1283,7 +3440,7 @@ async def create_challenge(ctx, member: discord.Member, challenge_type: str = 'c
             name="Challenge Details",
             value=f"**Type:** {config['name']}\n"
                   f"**Description:** {config['description']}\n"
-                  f"**Scoring:** +{config['correct_points']} correct, {config['wrong_points']} wrong\n"
+                  f"**Scoring:** +{config['correct_points']} correct, {config['wrong_points']} wrong{speed_bonus_text(config)}\n"
                   f"**Question Bank:** `{qbank_code}`\n"
                   f"{'**Time Limit:** ' + str(config['time_limit']) + 's per question' if config['time_limit'] else '**Time Limit:** None'}",
             inline=False
@@ -1302,10 +3459,468 @@ async def create_challenge(ctx, member: discord.Member, challenge_type: str = 'c
 
         view = ChallengeView(ctx.author.id, member.id, challenge_type, qbank_code, ctx.channel.id)
         await ctx.send(f"{member.mention}", embed=embed, view=view)
-    except Exception as e:
-        print(f"Error in create_challenge: {e}")
+    except Exception:
+        log.exception("Error in create_challenge")
         await ctx.send("An error occurred while creating the challenge.")
 
+async def finalize_challenge(challenge, cid, before_snowflake=float('inf'), reason=None):
+    """Score answers sent before before_snowflake, save stats, post results and drop the challenge.
+
+    Returns the private channel (None if it's gone) for the caller to release, or
+    False if the challenge was already being finalized.
+    """
+    bind_log_context(challenge_id=challenge.challenge_id)
+    players_list = list(challenge.players.values())
+
+    await channel_actors.close(cid, before_snowflake)
+    if not challenge.is_active:
+        return False
+    challenge.is_active = False
+
+    timer_scheduler.cancel(cid)
+    if challenge.scoreboard:
+        await challenge.scoreboard.close()
+
+    player1, player2 = players_list[0], players_list[1]
+    winner = challenge.get_winner()
+    await save_challenge_stats(challenge)
+
+    embed = discord.Embed(title="Challenge Complete!", color=0xffd700 if winner else 0x888888)
+    if winner:
+        embed.description = f"**{winner.username}** wins with {winner.total_points} points!"
+    else:
+        embed.description = "It's a tie! Both players scored equally!"
+
+    embed.add_field(name=f"{player1.username}", value=f"**Score:** {player1.total_points}\n**Correct:** {player1.correct_count}\n**Wrong:** {player1.wrong_count}", inline=True)
+    embed.add_field(name=f"{player2.username}", value=f"**Score:** {player2.total_points}\n**Correct:** {player2.correct_count}\n**Wrong:** {player2.wrong_count}", inline=True)
+
+    challenge_config = CHALLENGE_TYPES[challenge.challenge_type]
+    embed.add_field(
+        name="Challenge Info",
+        value=f"**Type:** {challenge_config['name']}\n"
+              f"**Q-Bank:** `{challenge.qbank_code}`",
+        inline=False
+    )
+    if reason:
+        embed.add_field(name="Ended Automatically", value=reason, inline=False)
+    embed.set_footer(text=f"Challenge ID: {challenge.challenge_id}")
+
+    chn = bot.get_channel(cid)
+    if chn:
+        await outbound.send(chn, PRIORITY_COMMAND, embed=embed)
+
+    main_channel = bot.get_channel(challenge.main_channel_id)
+    if main_channel:
+        await outbound.send(main_channel, PRIORITY_COMMAND, content="**Challenge Results Posted!**\n", embed=embed)
+
+    for uid in list(challenge.players.keys()):
+        if uid in user_active_challenges:
+            del user_active_challenges[uid]
+
+    if cid in challenge_channels:
+        del challenge_channels[cid]
+    if cid in active_challenges:
+        del active_challenges[cid]
+    state_snapshotter.forget('challenge', cid)
+    return chn
+
+class PendingDeletion:
+    def __init__(self, channel_id, guild_id, reason, due_at, attempts=0, action='delete'):
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.reason = reason
+        self.due_at = due_at
+        self.attempts = attempts
+        self.action = action  # 'delete', or 'recycle' to hand a pooled room back to room_provider
+
+class ChannelDeletionQueue:
+    """Deletes (or recycles) finished challenge rooms after a grace period, surviving restarts.
+
+    Each deletion is committed to channel_deletions before the caller moves on,
+    and reloaded at startup. One task starts due deletions in order, paced by a
+    token bucket per guild; failures are retried with exponential backoff, and
+    a pooled room that can't be recycled is deleted instead.
+    """
+
+    def __init__(self, manager, queue):
+        self.manager = manager
+        self.queue = queue
+        self.heap = []  # (due_at, seq, PendingDeletion)
+        self.pending = {}  # channel_id: PendingDeletion
+        self.seq = itertools.count()
+        self.guild_buckets = {}  # guild_id: TokenBucket
+        self.in_flight = set()  # Running deletion tasks
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    @property
+    def depth(self):
+        return len(self.pending)
+
+    async def schedule(self, channel_id, guild_id, grace=CHANNEL_DELETE_GRACE, reason="Challenge completed",
+                       action='delete'):
+        """Persist a deletion of the channel due in grace seconds; returns without waiting for it"""
+        deletion = PendingDeletion(channel_id, guild_id, reason, time.time() + grace, action=action)
+        try:
+            async with self.manager.transaction() as db:
+                await db.execute("""
+                    INSERT OR REPLACE INTO channel_deletions (channel_id, guild_id, reason, due_at, attempts, action)
+                    VALUES (?, ?, ?, ?, 0, ?)
+                """, (deletion.channel_id, deletion.guild_id, deletion.reason, deletion.due_at, deletion.action))
+        except Exception:
+            # Still delete it this run; it just won't survive a restart
+            log.exception("Error persisting deletion of channel %s", channel_id)
+        self._push(deletion)
+
+    async def load(self):
+        """Re-queue deletions left over from before a restart; overdue ones run right away"""
+        try:
+            rows = await self.manager.fetchall(
+                'SELECT channel_id, guild_id, reason, due_at, attempts, action FROM channel_deletions')
+        except Exception:
+            log.exception("Error loading pending channel deletions")
+            return
+        for row in rows:
+            self._push(PendingDeletion(*row))
+        if rows:
+            log.info("Loaded %s pending channel deletion(s)", len(rows))
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def stop(self):
+        # Rows stay in channel_deletions, so anything unfinished runs after the next start
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        for task in list(self.in_flight):
+            task.cancel()
+
+    def _push(self, deletion):
+        self.pending[deletion.channel_id] = deletion
+        heapq.heappush(self.heap, (deletion.due_at, next(self.seq), deletion))
+        self.wakeup.set()
+
+    async def _run(self):
+        log_context.set({})
+        while True:
+            self.wakeup.clear()
+            delay = self._dispatch_due()
+            if delay is None:
+                await self.wakeup.wait()
+            else:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+
+    def _dispatch_due(self):
+        """Start every due deletion its guild's bucket allows; returns seconds until the next is due, or None"""
+        now = time.time()
+        deferred = []
+        delay = None
+        while self.heap and len(self.in_flight) < CHANNEL_DELETE_CONCURRENCY:
+            due_at, _, deletion = self.heap[0]
+            if self.pending.get(deletion.channel_id) is not deletion:
+                heapq.heappop(self.heap)  # Rescheduled since this entry was pushed
+                continue
+            if due_at > now:
+                delay = due_at - now if delay is None else min(delay, due_at - now)
+                break
+            entry = heapq.heappop(self.heap)
+            bucket = self.guild_buckets.setdefault(deletion.guild_id, TokenBucket(*CHANNEL_DELETE_GUILD_RATE))
+            wait = bucket.wait_time(time.monotonic())
+            if wait > 0:
+                deferred.append(entry)
+                delay = wait if delay is None else min(delay, wait)
+                continue
+            bucket.take()
+            task = asyncio.create_task(self._delete(deletion))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+        for entry in deferred:
+            heapq.heappush(self.heap, entry)
+        return delay
+
+    async def _delete(self, deletion):
+        bind_log_context(guild_id=deletion.guild_id, channel_id=deletion.channel_id)
+        try:
+            if deletion.action == 'recycle':
+                outcome = await room_provider.recycle(deletion.channel_id, deletion.guild_id)
+            else:
+                # Straight to REST: the channel may not be cached, e.g. right after a restart
+                await bot.http.delete_channel(deletion.channel_id, reason=deletion.reason)
+                outcome = 'deleted'
+        except discord.NotFound:
+            self._finish(deletion, 'gone')
+        except discord.Forbidden as e:
+            log.error("Not allowed to delete challenge channel: %s", e)
+            self._finish(deletion, 'forbidden')
+        except Exception as e:
+            deletion.attempts += 1
+            if deletion.attempts >= CHANNEL_DELETE_MAX_ATTEMPTS and deletion.action == 'recycle':
+                log.error("Giving up recycling challenge room after %s attempts, deleting it: %s", deletion.attempts, e)
+                deletion.action = 'delete'
+                deletion.attempts = 0
+                deletion.due_at = time.time()
+            elif deletion.attempts >= CHANNEL_DELETE_MAX_ATTEMPTS:
+                log.error("Giving up deleting challenge channel after %s attempts: %s", deletion.attempts, e)
+                self._finish(deletion, 'failed')
+                return
+            else:
+                deletion.due_at = time.time() + CHANNEL_DELETE_RETRY_BASE * 2 ** (deletion.attempts - 1)
+                log.warning("Failed to %s challenge room (attempt %s), retrying: %s", deletion.action, deletion.attempts, e)
+            self.queue.enqueue("""
+                UPDATE channel_deletions SET attempts = ?, due_at = ?, action = ?, last_error = ? WHERE channel_id = ?
+            """, (deletion.attempts, deletion.due_at, deletion.action, str(e), deletion.channel_id))
+            if self.pending.get(deletion.channel_id) is deletion:
+                heapq.heappush(self.heap, (deletion.due_at, next(self.seq), deletion))
+        else:
+            self._finish(deletion, outcome)
+        finally:
+            self.wakeup.set()
+
+    def _finish(self, deletion, outcome):
+        channel_deletions_done.inc(outcome)
+        if outcome != 'recycled':
+            room_provider.forget(deletion.channel_id)
+        if self.pending.get(deletion.channel_id) is deletion:
+            del self.pending[deletion.channel_id]
+            self.queue.enqueue("DELETE FROM channel_deletions WHERE channel_id = ?", (deletion.channel_id,))
+
+channel_deletions = ChannelDeletionQueue(db_manager, write_queue)
+channel_deletions_done = metrics.register(Counter(
+    'harrow_channel_deletions_total', 'Challenge room deletions and recycles by outcome', ('outcome',)))
+metrics.register(Gauge(
+    'harrow_channel_deletions_pending', 'Challenge channels waiting to be deleted',
+    callback=lambda: channel_deletions.depth))
+
+class RoomProvider:
+    """Hands out a private room for each accepted challenge and takes it back afterwards.
+
+    In 'pool' mode every guild keeps ROOM_POOL_SIZE hidden channels warm; a
+    challenge takes the longest-idle one by rewriting its permission overwrites
+    (never its name, which Discord rate-limits hard), and releasing it hides it
+    again and clears its messages.
+    'thread' mode opens a private thread under ROOM_THREAD_PARENT_NAME instead,
+    and 'channel' mode creates and deletes a channel per challenge. Releases go
+    through channel_deletions, so they happen after the grace period even
+    across restarts. Edits, purges and deletes of pooled rooms go through
+    outbound like any other request the bot makes in a channel.
+    """
+
+    REQUIRED_PERMISSIONS = {
+        'pool': ('manage_channels', 'manage_roles'),
+        'thread': ('manage_channels', 'create_private_threads', 'manage_threads'),
+        'channel': ('manage_channels',),
+    }
+
+    def __init__(self, mode, manager, queue):
+        if mode not in self.REQUIRED_PERMISSIONS:
+            log.warning("Unknown room mode %r, using channel", mode)
+            mode = 'channel'
+        self.mode = mode
+        self.manager = manager
+        self.queue = queue
+        self.pool = {}  # channel_id: guild_id for every pooled room
+        self.idle = defaultdict(deque)  # guild_id: pooled channel IDs waiting for a challenge, oldest first
+        self.busy = set()  # Pooled channel IDs hosting a challenge or waiting to be recycled
+        self.guild_locks = defaultdict(asyncio.Lock)  # Guild ID -> lock so concurrent callers create one parent
+        self.refills = {}  # guild_id: task warming the guild's pool
+
+    def missing_permissions(self, member):
+        perms = member.guild_permissions
+        return [name.replace('_', ' ').title() for name in self.REQUIRED_PERMISSIONS[self.mode]
+                if not getattr(perms, name)]
+
+    def room_overwrites(self, guild, members=()):
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(read_messages=False),
+            guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True)
+        }
+        for member in members:
+            overwrites[member] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+        return overwrites
+
+    async def load(self):
+        """Load the pooled rooms recorded before a restart"""
+        try:
+            rows = await self.manager.fetchall('SELECT channel_id, guild_id, in_use FROM challenge_rooms')
+        except Exception:
+            log.exception("Error loading challenge rooms")
+            return
+        for channel_id, guild_id, in_use in rows:
+            self.pool[channel_id] = guild_id
+            if in_use:
+                self.busy.add(channel_id)
+            else:
+                self.idle[guild_id].append(channel_id)
+
+    async def reconcile(self):
+        """Once challenges are restored, line pooled rooms up with them: rooms hosting a
+        restored challenge are busy, busy rooms nobody came back to get recycled"""
+        for guild_id, idle in self.idle.items():
+            for channel_id in [cid for cid in idle if cid in challenge_channels]:
+                idle.remove(channel_id)
+                self._mark(channel_id, True)
+        for channel_id in list(self.busy):
+            if channel_id not in challenge_channels and channel_id not in channel_deletions.pending:
+                await channel_deletions.schedule(channel_id, self.pool[channel_id], grace=0,
+                                                 reason="Recycling challenge room", action='recycle')
+
+    async def acquire(self, guild, name, members):
+        """Return a room only the bot and members can see, named name unless it's pooled"""
+        if self.mode == 'thread':
+            return await self._open_thread(guild, name, members)
+
+        overwrites = self.room_overwrites(guild, members)
+        if self.mode == 'channel':
+            return await guild.create_text_channel(name=name, overwrites=overwrites,
+                                                   reason="Challenge accepted - private battle channel")
+
+        channel = await self._take_idle(guild, overwrites)
+        if channel is None:
+            channel = await self._create_pooled(guild, overwrites, in_use=True)
+        self._refill_later(guild)
+        return channel
+
+    async def release(self, channel, grace=CHANNEL_DELETE_GRACE):
+        """Give players grace seconds to read the results, then recycle or delete the room"""
+        action = 'recycle' if channel.id in self.pool else 'delete'
+        await channel_deletions.schedule(channel.id, channel.guild.id, grace, action=action)
+
+    async def recycle(self, channel_id, guild_id):
+        """Hide a pooled room again and clear its messages; returns the outcome for channel_deletions"""
+        await bot.wait_until_ready()  # Deletions reloaded at startup run before the guild cache fills
+        guild = bot.get_guild(guild_id)
+        channel = guild.get_channel(channel_id) if guild else None
+        if channel_id not in self.pool or channel is None:
+            return 'gone'
+        if len(self.idle[guild_id]) >= ROOM_POOL_SIZE:
+            # Surplus from a busy spell; let the pool shrink back
+            await outbound.call(channel, PRIORITY_ANNOUNCEMENT, 'delete',
+                                reason="Challenge completed - room pool is full")
+            return 'deleted'
+
+        # Hide it first so players lose access before the purge finishes
+        await outbound.call(channel, PRIORITY_ANNOUNCEMENT, 'edit', overwrites=self.room_overwrites(guild),
+                            reason="Challenge completed - returning room to the pool")
+        purged = await outbound.call(channel, PRIORITY_ANNOUNCEMENT, 'purge', limit=ROOM_PURGE_LIMIT,
+                                     reason="Challenge completed - clearing room for reuse")
+        if len(purged) >= ROOM_PURGE_LIMIT:
+            # Possibly more history; cheaper to replace the room than to keep scanning
+            await outbound.call(channel, PRIORITY_ANNOUNCEMENT, 'delete',
+                                reason="Challenge completed - too much history to recycle")
+            self._refill_later(guild)
+            return 'deleted'
+        self.idle[guild_id].append(channel_id)
+        self._mark(channel_id, False)
+        return 'recycled'
+
+    def forget(self, channel_id):
+        guild_id = self.pool.pop(channel_id, None)
+        if guild_id is None:
+            return
+        self.busy.discard(channel_id)
+        with contextlib.suppress(ValueError):
+            self.idle[guild_id].remove(channel_id)
+        self.queue.enqueue("DELETE FROM challenge_rooms WHERE channel_id = ?", (channel_id,))
+
+    def _mark(self, channel_id, in_use):
+        if in_use:
+            self.busy.add(channel_id)
+        else:
+            self.busy.discard(channel_id)
+        self.queue.enqueue("UPDATE challenge_rooms SET in_use = ? WHERE channel_id = ?", (int(in_use), channel_id))
+
+    async def _take_idle(self, guild, overwrites):
+        idle = self.idle[guild.id]
+        while idle:
+            channel_id = idle.popleft()
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                self.forget(channel_id)
+                continue
+            self._mark(channel_id, True)
+            try:
+                await outbound.call(channel, PRIORITY_COMMAND, 'edit', overwrites=overwrites,
+                                    reason="Challenge accepted - private battle room")
+            except discord.NotFound:
+                self.forget(channel_id)
+                continue
+            except Exception:
+                idle.appendleft(channel_id)
+                self._mark(channel_id, False)
+                raise
+            return channel
+        return None
+
+    async def _create_pooled(self, guild, overwrites, in_use):
+        category = await self._category(guild)
+        if category and len(category.channels) >= CATEGORY_CHANNEL_LIMIT:
+            category = None
+        channel = await guild.create_text_channel(name=ROOM_POOL_NAME, overwrites=overwrites, category=category,
+                                                  reason="Challenge room pool")
+        self.pool[channel.id] = guild.id
+        if in_use:
+            self.busy.add(channel.id)
+        else:
+            self.idle[guild.id].append(channel.id)
+        self.queue.enqueue("INSERT OR REPLACE INTO challenge_rooms (channel_id, guild_id, in_use) VALUES (?, ?, ?)",
+                           (channel.id, guild.id, int(in_use)))
+        return channel
+
+    def _refill_later(self, guild):
+        task = self.refills.get(guild.id)
+        if task is None or task.done():
+            self.refills[guild.id] = asyncio.create_task(self._refill(guild))
+
+    async def _refill(self, guild):
+        log_context.set({'guild_id': guild.id, 'command': 'room_pool'})
+        try:
+            while len(self.idle[guild.id]) < ROOM_POOL_SIZE:
+                await self._create_pooled(guild, self.room_overwrites(guild), in_use=False)
+        except Exception:
+            log.exception("Error warming challenge room pool")
+
+    async def _category(self, guild):
+        async with self.guild_locks[guild.id]:
+            category = discord.utils.get(guild.categories, name=ROOM_CATEGORY_NAME)
+            if category is None:
+                category = await guild.create_category(
+                    ROOM_CATEGORY_NAME, overwrites=self.room_overwrites(guild), reason="Challenge room pool")
+            return category
+
+    async def _thread_parent(self, guild):
+        async with self.guild_locks[guild.id]:
+            parent = discord.utils.get(guild.text_channels, name=ROOM_THREAD_PARENT_NAME)
+            if parent is None:
+                overwrites = {
+                    guild.default_role: discord.PermissionOverwrite(
+                        send_messages=False, send_messages_in_threads=True,
+                        create_public_threads=False, create_private_threads=False),
+                    guild.me: discord.PermissionOverwrite(
+                        read_messages=True, send_messages=True, manage_threads=True, create_private_threads=True)
+                }
+                parent = await guild.create_text_channel(
+                    ROOM_THREAD_PARENT_NAME, overwrites=overwrites,
+                    topic="Private challenge threads live here", reason="Challenge thread parent")
+            return parent
+
+    async def _open_thread(self, guild, name, members):
+        parent = await self._thread_parent(guild)
+        thread = await parent.create_thread(
+            name=name, type=discord.ChannelType.private_thread, invitable=False,
+            auto_archive_duration=ROOM_THREAD_ARCHIVE_MINUTES, reason="Challenge accepted - private battle thread")
+        await asyncio.gather(*(thread.add_user(member) for member in members))
+        return thread
+
+room_provider = RoomProvider(ROOM_MODE, db_manager, write_queue)
+metrics.register(Gauge(
+    'harrow_room_pool', 'Pooled challenge rooms by state', ('state',),
+    callback=lambda: {('idle',): sum(len(idle) for idle in room_provider.idle.values()),
+                      ('busy',): len(room_provider.busy)}))
+
 @bot.command(name='endchallenge')
 async def end_challenge(ctx):
     try:
@@ -1316,67 +3931,218 @@ async def end_challenge(ctx):
         if cid in challenge_channels:
             challenge = challenge_channels[cid]
         else:
-            for ch in challenge_channels.values():
-                if ctx.author.id in ch.players:
-                    challenge = ch
-                    break
+            cid = user_active_challenges.get(ctx.author.id)
+            challenge = challenge_channels.get(cid)
             if not challenge:
                 await ctx.send("No active challenge found for this channel or user!")
                 return
-            cid = challenge.private_channel_id
 
-        players_list = list(challenge.players.values())
-        if len(players_list) < 2:
+        if len(challenge.players) < 2:
             await ctx.send("Invalid challenge state!")
             return
 
-        player1, player2 = players_list[0], players_list[1]
-        winner = challenge.get_winner()
-        await save_challenge_stats(challenge)
+        # Let answers sent before this command finish scoring, then stop accepting more
+        chn = await finalize_challenge(challenge, cid, ctx.message.id)
+        if chn is False:
+            return  # Another !endchallenge got here first
 
-        embed = discord.Embed(title="Challenge Complete!", color=0xffd700 if winner else 0x888888)
-        if winner:
-            embed.description = f"**{winner.username}** wins with {winner.total_points} points!"
-        else:
-            embed.description = "It's a tie! Both players scored equally!"
+        if chn:
+            await room_provider.release(chn)
+    except Exception:
+        log.exception("Error in end_challenge")
+        await ctx.send("An error occurred while ending the challenge.")
+
+@bot.command(name='replay')
+@commands.guild_only()
+async def replay_challenge(ctx, challenge_id: str):
+    """Recompute a finished challenge's totals from its answer log"""
+    try:
+        if not ctx.author.guild_permissions.manage_messages:
+            await ctx.send("You need Manage Messages permission to use this command!")
+            return
+
+        result = await replay_challenge_events(challenge_id, ctx.guild.id)
+        if not result:
+            await ctx.send("No finished challenge with that ID in this server!")
+            return
+
+        challenge_type, players = result
+        embed = discord.Embed(
+            title="Challenge Replay",
+            description=f"**Type:** {CHALLENGE_TYPES[challenge_type]['name']}\n"
+                        f"Totals rebuilt from {sum(p.correct_count + p.wrong_count for p in players.values())} logged answers",
+            color=0x3498db
+        )
+        for player in players.values():
+            name = get_cached_display_name(ctx.guild, player.user_id, f"User {player.user_id}")
+            embed.add_field(
+                name=name,
+                value=f"**Score:** {player.total_points}\n**Correct:** {player.correct_count}\n**Wrong:** {player.wrong_count}",
+                inline=True
+            )
+        embed.set_footer(text=f"Challenge ID: {challenge_id}")
+        await ctx.send(embed=embed)
+    except Exception:
+        log.exception("Error in replay_challenge")
+        await ctx.send("An error occurred while replaying the challenge.")
+
+def format_pace(median, p90, answers):
+    if median is None:
+        return "Not enough answers yet"
+    return f"**Median:** {median:.1f}s\n**p90:** {p90:.1f}s\n**Timed answers:** {answers}"
+
+@bot.command(name='pace')
+@commands.guild_only()
+async def show_pace(ctx, member: discord.Member = None):
+    """Show time between answers: live for this challenge, or a player's history"""
+    try:
+        challenge = challenge_channels.get(ctx.channel.id)
+        if challenge and not member:
+            embed = discord.Embed(title="Challenge Pace", color=0x3498db)
+            limit = challenge.config['time_limit']
+            for user_id, player in challenge.players.items():
+                tracker = challenge.pace[user_id]
+                value = format_pace(tracker.quantile(0.5), tracker.quantile(0.9), len(tracker.gaps))
+                if limit and challenge.config.get('speed_bonus') and tracker.gaps:
+                    fast = bisect.bisect_right(tracker.gaps, limit * SPEED_BONUS_FRACTION)
+                    value += f"\n**Under {limit * SPEED_BONUS_FRACTION:g}s:** {fast}"
+                embed.add_field(name=get_cached_display_name(ctx.guild, user_id, player.username),
+                                value=value, inline=True)
+            if limit:
+                embed.set_footer(text=f"Time limit: {limit}s per question")
+            await ctx.send(embed=embed)
+            return
+
+        member = member or ctx.author
+        rows = await get_pace_history(member.id, ctx.guild.id)
+        embed = discord.Embed(
+            title=f"Answer Pace: {member.display_name}",
+            description=format_pace(weighted_quantile(rows, 0.5), weighted_quantile(rows, 0.9),
+                                    sum(weight for _, weight in rows)),
+            color=0x3498db
+        )
+        embed.set_footer(text="Across all logged challenges in this server")
+        await ctx.send(embed=embed)
+    except Exception:
+        log.exception("Error in show_pace")
+        await ctx.send("An error occurred while calculating pace.")
+
+def format_latency(histogram, *labels):
+    count = histogram.count(*labels)
+    if not count:
+        return "no samples"
+    p50, p95 = histogram.quantile(0.5, *labels), histogram.quantile(0.95, *labels)
+    return f"{count} | p50 {p50 * 1000:.1f}ms | p95 {p95 * 1000:.1f}ms"
+
+@bot.command(name='perf')
+@commands.guild_only()
+async def show_perf(ctx):
+    """Show the bot's live performance metrics"""
+    try:
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.send("You need Manage Server permission to use this command!")
+            return
 
-        embed.add_field(name=f"{player1.username}", value=f"**Score:** {player1.total_points}\n**Correct:** {player1.correct_count}\n**Wrong:** {player1.wrong_count}", inline=True)
-        embed.add_field(name=f"{player2.username}", value=f"**Score:** {player2.total_points}\n**Correct:** {player2.correct_count}\n**Wrong:** {player2.wrong_count}", inline=True)
+        uptime = timedelta(seconds=int(time.time() - metrics.started_at))
+        embed = discord.Embed(title="Harrow Performance", description=f"Uptime: {uptime}", color=0x3498db)
 
-        challenge_config = CHALLENGE_TYPES[challenge.challenge_type]
+        paths = sorted(on_message_latency.counts, key=lambda labels: -on_message_latency.count(*labels))
         embed.add_field(
-            name="Challenge Info",
-            value=f"**Type:** {challenge_config['name']}\n"
-                  f"**Q-Bank:** `{challenge.qbank_code}`",
+            name="Message Handling",
+            value="\n".join(f"**{labels[0]}:** {format_latency(on_message_latency, *labels)}" for labels in paths)
+                  or "No messages yet",
             inline=False
         )
 
-        chn = bot.get_channel(cid)
-        if chn:
-            await chn.send(embed=embed)
+        scored = ", ".join(f"{labels[0]} {int(count)}" for labels, count in answers_scored.values.items())
+        if scoreboard_edits.get():
+            scored += f"\n**Scoreboard:** {int(scoreboard_answers.get())} answers in {int(scoreboard_edits.get())} edits"
+        embed.add_field(name="Answers Scored", value=scored or "None yet", inline=False)
 
-        main_channel = bot.get_channel(challenge.main_channel_id)
-        if main_channel:
-            await main_channel.send("**Challenge Results Posted!**\n", embed=embed)
+        embed.add_field(
+            name="Database",
+            value=f"**Writes:** {format_latency(db_write_latency)}\n"
+                  f"**Queue depth:** {write_queue.depth}\n"
+                  f"**Records:** {write_queue.records_written} written in {write_queue.batches_committed} batches, "
+                  f"{write_queue.records_failed} failed",
+            inline=False
+        )
 
-        for uid in list(challenge.players.keys()):
-            if uid in user_active_challenges:
-                del user_active_challenges[uid]
+        busiest = sorted(rest_requests.values.items(), key=lambda item: -item[1])[:5]
+        embed.add_field(
+            name="Discord REST",
+            value=f"**Requests:** {int(sum(rest_requests.values.values()))} | "
+                  f"**Rate limited:** {int(sum(rate_limit_hits.values.values()))}\n"
+                  + "\n".join(f"`{labels[0]}` {int(count)}" for labels, count in busiest),
+            inline=False
+        )
 
-        if cid in challenge_channels:
-            del challenge_channels[cid]
-        if cid in active_challenges:
-            del active_challenges[cid]
+        embed.add_field(
+            name="Outbound Queue",
+            value=" | ".join(f"**{name}:** {outbound.depth(priority)}" for priority, name in PRIORITY_NAMES.items())
+                  + f"\n**In flight:** {len(outbound.in_flight)} | "
+                    f"**Edits merged:** {int(sum(outbound_coalesced.values.values()))}\n"
+                    f"**Feedback wait:** {format_latency(outbound_wait, 'feedback')}",
+            inline=False
+        )
 
-        await asyncio.sleep(10)
-        try:
-            if chn:
-                await chn.delete(reason="Challenge completed")
-        except Exception as e:
-            print(f"Failed to delete challenge channel: {e}")
-    except Exception as e:
-        print(f"Error in end_challenge: {e}")
-        await ctx.send("An error occurred while ending the challenge.")
+        members = member_cache.stats()
+        embed.add_field(
+            name="Caches",
+            value=f"**Members:** {members['hit_rate']:.0%} hit rate "
+                  f"({members['hits']} hits, {members['misses']} misses, {members['size']} cached)\n"
+                  f"**Webhooks:** {webhook_cache.hits} hits, {webhook_cache.misses} misses, "
+                  f"{len(webhook_cache.entries)} cached",
+            inline=False
+        )
+
+        embed.add_field(
+            name="Active",
+            value=f"**Challenges:** {len(challenge_channels)} | **Mono:** {len(mono_sessions)} | "
+                  f"**Games:** {len(active_games)} | **Actors:** {len(channel_actors.actors)}\n"
+                  f"**Rooms:** {sum(len(idle) for idle in room_provider.idle.values())} idle, "
+                  f"{len(room_provider.busy)} busy ({room_provider.mode}) | "
+                  f"**Awaiting release:** {channel_deletions.depth}",
+            inline=False
+        )
+        if metrics_server:
+            embed.set_footer(text=f"Prometheus: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        await ctx.send(embed=embed)
+    except Exception:
+        log.exception("Error in show_perf")
+        await ctx.send("An error occurred while collecting metrics.")
+
+@bot.command(name='scoreboard')
+async def toggle_scoreboard(ctx, mode: str = None):
+    """Switch a challenge between the live scoreboard and per-answer messages"""
+    try:
+        challenge = challenge_channels.get(ctx.channel.id)
+        if not challenge:
+            await ctx.send("Use this command inside an active challenge channel!")
+            return
+
+        if ctx.author.id not in challenge.players:
+            await ctx.send("Only challenge players can change the scoreboard mode!")
+            return
+
+        mode = (mode or ('off' if challenge.live_scoreboard else 'on')).lower()
+        if mode == 'on':
+            challenge.live_scoreboard = True
+            if not (challenge.scoreboard and challenge.scoreboard.is_live):
+                await start_live_scoreboard(challenge, ctx.channel)
+            await ctx.send("Live scoreboard enabled - answers update the pinned scoreboard.")
+        elif mode == 'off':
+            challenge.live_scoreboard = False
+            if challenge.scoreboard:
+                await challenge.scoreboard.close()
+                challenge.scoreboard = None
+            state_snapshotter.mark('challenge', ctx.channel.id)
+            await ctx.send("Live scoreboard disabled - each answer gets its own message.")
+        else:
+            await ctx.send("Usage: `!scoreboard [on/off]`")
+    except Exception:
+        log.exception("Error in toggle_scoreboard")
+        await ctx.send("An error occurred while changing the scoreboard mode.")
 
 # Utility commands
 @bot.command(name='qbank')
@@ -1400,13 +4166,151 @@ async def generate_qbank_link(ctx, code: str, member: discord.Member = None):
             await ctx.send(f"{member.mention} - You've been invited to a quiz!", embed=embed)
         else:
             await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in generate_qbank_link: {e}")
+    except Exception:
+        log.exception("Error in generate_qbank_link")
         await ctx.send("An error occurred while generating the question bank link.")
 
 # Timer functionality for challenges
+TIMER_CHECKPOINTS = (10, 5)  # Seconds remaining at which the timer message is refreshed
+TIMER_RESET_INTERVAL = 5.0  # Min seconds between edits announcing a reset; later resets wait for the next slot
+
+def build_timer_embed(remaining, ends_at=None):
+    if remaining <= 0:
+        return discord.Embed(
+            title="Time's Up!",
+            description="Move to the next question",
+            color=0xff0000
+        )
+
+    if remaining <= 5:
+        color = 0xff0000
+    elif remaining <= 10:
+        color = 0xff6600
+    else:
+        color = 0xffff00
+
+    description = f"Time remaining: {remaining} seconds"
+    if ends_at:
+        # Discord renders the relative timestamp as a live countdown client-side
+        description += f"\nEnds <t:{int(ends_at)}:R>"
+    return discord.Embed(title="Question Timer", description=description, color=color)
+
+class ChallengeTimer:
+    def __init__(self, channel_id, duration, message):
+        self.channel_id = channel_id
+        self.duration = duration
+        self.message = message
+        self.generation = 0  # Bumped on every reset so stale wake-ups are ignored
+        self.last_announced = float('-inf')  # Loop time of the last reset edit
+        self.edit_lock = asyncio.Lock()
+
+class TimerScheduler:
+    """Drives every challenge timer from one task and a heap of wake-ups.
+
+    A timer's message is only edited at coarse checkpoints (question start,
+    TIMER_CHECKPOINTS and expiry); the relative timestamp in the embed keeps
+    the countdown moving in between. Resets are announced at most once per
+    TIMER_RESET_INTERVAL, so a fast run of answers costs one trailing edit.
+    """
+
+    def __init__(self):
+        self.heap = []  # (when, seq, timer, generation, remaining, announces)
+        self.timers = {}  # channel_id: ChallengeTimer
+        self.seq = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.updates = set()  # Running edit tasks; the loop only holds weak references
+
+    async def start(self, channel, duration):
+        self.cancel(channel.id)
+        message = await outbound.send(channel, PRIORITY_TIMER, embed=build_timer_embed(duration, time.time() + duration))
+        timer = ChallengeTimer(channel.id, duration, message)
+        self.timers[channel.id] = timer
+        self._arm(timer, announce=False)
+
+    def reset(self, channel_id):
+        """Restart the countdown for the next question"""
+        timer = self.timers.get(channel_id)
+        if timer:
+            self._arm(timer, announce=True)
+
+    def cancel(self, channel_id):
+        timer = self.timers.pop(channel_id, None)
+        if timer:
+            timer.generation += 1
+
+    def stop(self):
+        for channel_id in list(self.timers):
+            self.cancel(channel_id)
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        for task in list(self.updates):
+            task.cancel()
+
+    def _arm(self, timer, announce):
+        timer.generation += 1
+        now = asyncio.get_running_loop().time()
+        deadline = now + timer.duration
+        if announce:
+            # A reset inside the interval is announced when the interval ends, with the time left then
+            when = max(now, timer.last_announced + TIMER_RESET_INTERVAL)
+            if when < deadline:
+                self._push(when, timer, round(deadline - when), announces=True)
+        for remaining in TIMER_CHECKPOINTS:
+            if remaining < timer.duration:
+                self._push(deadline - remaining, timer, remaining)
+        self._push(deadline, timer, 0)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        self.wakeup.set()
+
+    def _push(self, when, timer, remaining, announces=False):
+        heapq.heappush(self.heap, (when, next(self.seq), timer, timer.generation, remaining, announces))
+
+    async def _run(self):
+        # Started from whichever handler armed the first timer; don't inherit its log context
+        log_context.set({})
+        loop = asyncio.get_running_loop()
+        while True:
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0][0] - loop.time()
+            if delay > 0:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                continue
+
+            when, _, timer, generation, remaining, announces = heapq.heappop(self.heap)
+            if timer.generation != generation:
+                continue
+            if announces:
+                timer.last_announced = when
+            # Edits run off the scheduler task so one slow channel can't delay the others
+            task = asyncio.create_task(self._update(timer, generation, remaining))
+            self.updates.add(task)
+            task.add_done_callback(self.updates.discard)
+
+    async def _update(self, timer, generation, remaining):
+        bind_log_context(channel_id=timer.channel_id)
+        async with timer.edit_lock:
+            if timer.generation != generation:
+                return
+            try:
+                await outbound.edit(timer.message, PRIORITY_TIMER,
+                                    embed=build_timer_embed(remaining, time.time() + remaining))
+            except discord.NotFound:
+                self.cancel(timer.channel_id)
+            except Exception:
+                log.exception("Error updating challenge timer")
+
+timer_scheduler = TimerScheduler()
+
 async def start_challenge_timer(channel_id, duration):
-    """Start a countdown timer for a challenge question"""
+    """Start the countdown timer for a challenge; it resets on every answer"""
     try:
         if channel_id not in challenge_channels:
             return
@@ -1415,52 +4319,17 @@ async def start_challenge_timer(channel_id, duration):
         if not channel:
             return
 
-        embed = discord.Embed(
-            title="Question Timer",
-            description=f"Time remaining: {duration} seconds",
-            color=0xffff00
-        )
-
-        timer_message = await channel.send(embed=embed)
-
-        for remaining in range(duration - 1, 0, -1):
-            await asyncio.sleep(1)
-            if channel_id not in challenge_channels:
-                break
-
-            if remaining <= 5:
-                color = 0xff0000
-            elif remaining <= 10:
-                color = 0xff6600
-            else:
-                color = 0xffff00
-
-            embed = discord.Embed(
-                title="Question Timer",
-                description=f"Time remaining: {remaining} seconds",
-                color=color
-            )
-
-            try:
-                await timer_message.edit(embed=embed)
-            except Exception:
-                break
-
-        if channel_id in challenge_channels:
-            embed = discord.Embed(
-                title="Time's Up!",
-                description="Move to the next question",
-                color=0xff0000
-            )
-
-            try:
-                await timer_message.edit(embed=embed)
-            except Exception:
-                pass
-    except Exception as e:
-        print(f"Error in start_challenge_timer: {e}")
+        await timer_scheduler.start(channel, duration)
+    except Exception:
+        log.exception("Error in start_challenge_timer")
 
 # Challenge info commands
+def speed_bonus_text(config):
+    if not (config['time_limit'] and config.get('speed_bonus')):
+        return ""
+    return (f" | Speed bonus: +{config['speed_bonus']} for the first correct answer in a message "
+            f"sent within {config['time_limit'] * SPEED_BONUS_FRACTION:g}s")
+
 @bot.command(name='challengetypes')
 async def show_challenge_types(ctx):
     """Show all available challenge types"""
@@ -1476,14 +4345,15 @@ async def show_challenge_types(ctx):
                 name=f"{config['name']}",
                 value=f"**{config['description']}**\n"
                       f"Correct: +{config['correct_points']} | Wrong: {config['wrong_points']}\n"
-                      f"{'Time: ' + str(config['time_limit']) + 's' if config['time_limit'] else 'No time limit'}",
+                      f"{'Time: ' + str(config['time_limit']) + 's' if config['time_limit'] else 'No time limit'}"
+                      f"{speed_bonus_text(config)}",
                 inline=False
             )
 
         embed.set_footer(text="Use: !challenge @user [type] [qbank_code]")
         await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in show_challenge_types: {e}")
+    except Exception:
+        log.exception("Error in show_challenge_types")
         await ctx.send("An error occurred while showing challenge types.")
 
 # Group game management commands
@@ -1505,6 +4375,7 @@ async def start_game(ctx, mode: str = 'classic'):
         session = GameSession(channel_id, mode.lower())
         active_games[channel_id] = session
         session.is_active = True
+        state_snapshotter.mark('game', channel_id)
 
         mode_info = GAME_MODES[mode.lower()]
         embed = discord.Embed(
@@ -1517,10 +4388,17 @@ async def start_game(ctx, mode: str = 'classic'):
         )
 
         await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in start_game: {e}")
+    except Exception:
+        log.exception("Error in start_game")
         await ctx.send("An error occurred while starting the game.")
 
+async def add_game_player(session, user_id, username):
+    """Runs on the game channel's actor"""
+    player = session.add_player(user_id, username)
+    session.last_activity = time.time()
+    state_snapshotter.mark('game', session.channel_id)
+    return player
+
 @bot.command(name='join')
 async def join_game(ctx):
     """Join the active game in this channel"""
@@ -1532,7 +4410,10 @@ async def join_game(ctx):
             return
 
         session = active_games[channel_id]
-        player = session.add_player(ctx.author.id, ctx.author.display_name)
+        player = await channel_actors.submit(channel_id, ctx.message.id, add_game_player,
+                                             session, ctx.author.id, ctx.author.display_name)
+        if not player:
+            return
 
         embed = discord.Embed(
             title="Joined Game!",
@@ -1542,10 +4423,129 @@ async def join_game(ctx):
 
         embed.add_field(name="Ride or Die Uses", value=f"{player.ride_or_die_uses}", inline=True)
         await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in join_game: {e}")
+    except Exception:
+        log.exception("Error in join_game")
         await ctx.send("An error occurred while joining the game.")
 
+async def finalize_game(session, channel, reason=None):
+    """Save stats, post the final standings and drop a group game"""
+    if active_games.get(session.channel_id) is not session:
+        return False
+    del active_games[session.channel_id]
+    session.is_active = False
+    state_snapshotter.forget('game', session.channel_id)
+    await channel_actors.close(session.channel_id)
+    await save_game_stats(session)
+
+    if channel:
+        embed = discord.Embed(title="Game Over!", description=f"**Mode:** {session.mode_config['name']}", color=0xffd700)
+        standings = "\n".join(f"{i}. **{player.username}** - {player.score:g} pts"
+                               for i, player in enumerate(session.get_leaderboard(10), 1))
+        embed.add_field(name="Final Standings", value=standings or "No players joined", inline=False)
+        if reason:
+            embed.add_field(name="Ended Automatically", value=reason, inline=False)
+        await outbound.send(channel, PRIORITY_COMMAND, embed=embed)
+    return True
+
+# Janitor: finalizes sessions nobody ended and reports what it reclaimed
+janitor_reclaimed = metrics.register(Counter(
+    'harrow_janitor_reclaimed_total', 'Idle sessions finalized by the janitor', ('kind',)))
+janitor_reclaimed_bytes = metrics.register(Counter(
+    'harrow_janitor_reclaimed_bytes_total', 'Approximate memory released by the janitor'))
+janitor_rooms_released = metrics.register(Counter(
+    'harrow_janitor_rooms_released_total', 'Challenge rooms the janitor released'))
+
+def approximate_size(obj, seen=None):
+    """Deep size of builtin containers and this module's objects; Discord objects are shared, so skipped"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif type(obj).__module__ == __name__ and hasattr(obj, '__dict__'):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+def idle_for(session, now):
+    return f"No activity for {int((now - session.last_activity) // 60)} minutes"
+
+@tasks.loop(minutes=JANITOR_INTERVAL_MINUTES)
+async def janitor():
+    log_context.set({'command': 'janitor'})
+    now = time.time()
+    reclaimed = defaultdict(int)
+    reclaimed_bytes = 0
+    channels_to_release = []
+
+    for cid, challenge in list(challenge_channels.items()):
+        if now - challenge.last_activity < CHALLENGE_IDLE_TTL or len(challenge.players) < 2:
+            continue
+        size = approximate_size(challenge)
+        try:
+            chn = await finalize_challenge(challenge, cid, reason=idle_for(challenge, now))
+        except Exception:
+            log.exception("Janitor failed to finalize challenge in %s", cid)
+            continue
+        if chn is not False:
+            reclaimed['challenge'] += 1
+            reclaimed_bytes += size
+            if chn:
+                channels_to_release.append(chn)
+
+    for channel_id, session in list(mono_sessions.items()):
+        if now - session.last_activity < MONO_IDLE_TTL:
+            continue
+        size = approximate_size(session)
+        try:
+            if await finalize_mono_session(session, bot.get_channel(channel_id), reason=idle_for(session, now)):
+                reclaimed['mono'] += 1
+                reclaimed_bytes += size
+        except Exception:
+            log.exception("Janitor failed to finalize mono session in %s", channel_id)
+
+    for channel_id, session in list(active_games.items()):
+        if now - session.last_activity < GAME_IDLE_TTL:
+            continue
+        size = approximate_size(session)
+        try:
+            if await finalize_game(session, bot.get_channel(channel_id), reason=idle_for(session, now)):
+                reclaimed['game'] += 1
+                reclaimed_bytes += size
+        except Exception:
+            log.exception("Janitor failed to finalize game in %s", channel_id)
+
+    # Mappings that outlived their challenge (e.g. a channel deleted by hand)
+    for user_id, channel_id in list(user_active_challenges.items()):
+        if channel_id not in challenge_channels:
+            del user_active_challenges[user_id]
+            reclaimed['user_mapping'] += 1
+
+    for chn in channels_to_release:
+        await room_provider.release(chn)
+    log_context.set({'command': 'janitor'})  # Finalizing bound the last challenge's ID
+
+    for kind, count in reclaimed.items():
+        janitor_reclaimed.inc(kind, amount=count)
+    janitor_reclaimed_bytes.inc(amount=reclaimed_bytes)
+    janitor_rooms_released.inc(amount=len(channels_to_release))
+    if reclaimed:
+        log.info("Janitor finalized %s challenge(s), %s mono session(s), %s game(s) and %s stale mapping(s); "
+                 "reclaimed ~%.1f KiB and released %s room(s)",
+                 reclaimed['challenge'], reclaimed['mono'], reclaimed['game'], reclaimed['user_mapping'],
+                 reclaimed_bytes / 1024, len(channels_to_release))
+
+@janitor.before_loop
+async def before_janitor():
+    await bot.wait_until_ready()
+
+@janitor.error
+async def janitor_error(error):
+    log.error("Janitor sweep failed: %s", error, exc_info=error)
+
 # Help command
 @bot.command(name='gamehelp')
 async def game_help(ctx):
@@ -1562,6 +4562,9 @@ async def game_help(ctx):
             value="`!challenge @user [type] [code]` - Start 1v1 battle\n"
                   "`!challengetypes` - Show all challenge types\n"
                   "`!endchallenge` - End current challenge\n"
+                  "`!scoreboard [on/off]` - Live scoreboard or per-answer messages\n"
+                  "`!replay [challenge id]` - Rebuild results from the answer log (mods)\n"
+                  "`!pace [@user]` - Time between answers (median/p90)\n"
                   "`!qbank [code] [@user]` - Generate Marrow link",
             inline=False
         )
@@ -1571,6 +4574,7 @@ async def game_help(ctx):
             value="`!mono [code] [correct] [total] [title]` - Submit quiz results\n"
                   "`!monostats` - View current leaderboard\n"
                   "`!endmono` - End mono session\n"
+                  "`!leaderboard [week/month/all]` - Server-wide standings\n"
                   "Example: `!mono 5DLH0B6Q 45 50 Practice Test`",
             inline=False
         )
@@ -1578,7 +4582,9 @@ async def game_help(ctx):
         embed.add_field(
             name="Persistent Shortcuts",
             value="`!getwebhook [@user]` - Get persistent webhook URL\n"
+                  "`!gettoken` - Token for direct HTTP answers (if enabled)\n"
                   "`!createloggingchannel` - Create/recreate logging channel\n"
+                  "`!perf` - Bot performance metrics (admins)\n"
                   "**One-time setup** - works for all future challenges!",
             inline=False
         )
@@ -1595,7 +4601,7 @@ async def game_help(ctx):
         embed.add_field(
             name="Challenge Types",
             value="**Classic** (+4/-1) - Standard scoring\n"
-                  "**Speed** (+6/-2, 20s) - Time pressure\n"
+                  "**Speed** (+6/-2, 20s) - Time pressure, +2 for answers under 10s\n"
                   "**Precision** (+5/-5) - Performance\n"
                   "**Survival** (+3/0) - No penalties",
             inline=False
@@ -1612,11 +4618,15 @@ async def game_help(ctx):
 
         embed.set_footer(text="Chill the world to death -Harrow Manifesto 20:11, p62")
         await ctx.send(embed=embed)
-    except Exception as e:
-        print(f"Error in game_help: {e}")
+    except Exception:
+        log.exception("Error in game_help")
         await ctx.send("An error occurred while showing help.")
 
 # Error handling
+@bot.before_invoke
+async def bind_command_log_context(ctx):
+    bind_log_context(command=ctx.command.qualified_name)
+
 @bot.event
 async def on_command_error(ctx, error):
     try:
@@ -1626,12 +4636,15 @@ async def on_command_error(ctx, error):
             await ctx.send("Missing required argument! Use `!gamehelp` for command usage.")
         elif isinstance(error, commands.BadArgument):
             await ctx.send("Invalid argument! Use `!gamehelp` for command usage.")
+        elif isinstance(error, commands.NoPrivateMessage):
+            await ctx.send("This command only works in a server.")
         else:
-            print(f"Error in {ctx.command}: {error}")
+            log.error("Error in %s: %s", ctx.command, error, exc_info=error)
             await ctx.send(f"An error occurred: {str(error)}")
-    except Exception as e:
-        print(f"Error in error handler: {e}")
+    except Exception:
+        log.exception("Error in error handler")
 
 # Main loop
 if __name__ == "__main__":
-    bot.run(token)
+    # Logging is already configured; stop discord.py from installing its own handler
+    bot.run(token, log_handler=None)
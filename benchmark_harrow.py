@@ -0,0 +1,379 @@
+"""Offline microbenchmarks for Harrow's core logic and database layer.
+
+Nothing here talks to Discord; DB helpers run against a throwaway SQLite file.
+
+    python benchmark_harrow.py                          # run everything, save benchmark_results/<commit>.json
+    python benchmark_harrow.py -k leaderboard           # only benchmarks whose name contains "leaderboard"
+    python benchmark_harrow.py --compare old.json       # also print the change against an earlier run
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+
+# Harrow refuses to import without a token; benchmarks never connect or write a log file
+os.environ.setdefault("DISCORD_TOKEN", "benchmark")
+os.environ.setdefault("HARROW_LOG_FILE", "")
+
+import discord
+import Harrow
+
+REPEATS = 5
+MIN_REPEAT_SECONDS = 0.05
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+benchmarks = []  # (name, kind, factory); factory returns the callable to time
+
+def benchmark(name, kind='sync'):
+    def register(factory):
+        benchmarks.append((name, kind, factory))
+        return factory
+    return register
+
+def summarize(loops, timings):
+    per_op = [t / loops * 1e6 for t in timings]
+    return {
+        'loops': loops,
+        'min_us': min(per_op),
+        'median_us': statistics.median(per_op),
+        'max_us': max(per_op),
+    }
+
+def time_sync(func):
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    return summarize(loops, timer.repeat(repeat=REPEATS, number=loops))
+
+async def time_async(func):
+    """Same calibration as timeit's autorange, for coroutine functions"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            await func()
+        if time.perf_counter() - start >= MIN_REPEAT_SECONDS:
+            break
+        loops *= 10
+
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(loops):
+            await func()
+        timings.append(time.perf_counter() - start)
+    return summarize(loops, timings)
+
+# Fixtures
+
+class FakeChannel:
+    """Stands in for a channel or command context; records what would have been sent"""
+
+    def __init__(self, channel_id=1000):
+        self.id = channel_id
+        self.channel = self
+        self.guild = None
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+def make_mono_session(size):
+    session = Harrow.MonoSession(1, "BENCH", 1000, "Benchmark", guild_id=1)
+    for user_id in range(size):
+        participant = session.add_participant(user_id, f"user{user_id}")
+        participant.total_questions = 50
+        participant.correct_count = (user_id * 7919) % 51
+        participant.percentage = participant.correct_count * 2.0
+        participant.total_score = participant.correct_count * 4
+        session.update_rank(user_id)
+    return session
+
+def make_challenge():
+    challenge = Harrow.Challenge(1, 2, 'speed', "BENCH", 1000, guild_id=1)
+    challenge.add_player(1, "challenger")
+    challenge.add_player(2, "challenged")
+    challenge.private_channel_id = 2000
+    challenge.is_active = True
+    challenge.live_scoreboard = False
+    return challenge
+
+# Core logic
+
+C, W = 'correct', 'wrong'
+
+# Parser cases: message -> expected answers. Checked before the parser benchmarks are timed,
+# so a benchmark run never reports numbers for a parser that gets these wrong.
+ANSWER_CASES = [
+    ("Y", [C]),
+    ("n", [W]),
+    ("<@123456789> yes", [C]),
+    ("Y Y N Y N", [C, C, W, C, W]),
+    ("Y, N", [C, W]),
+    ("Y x5", [C] * 5),
+    ("N*3 Y", [W, W, W, C]),
+    ("+ + -", [C, C, W]),
+    ("Y x0", []),
+    ("Y x51", []),
+    ("YYNYN", []),
+    ("nyc", []),
+    ("cwn", []),
+    ("+++", []),
+    ("----", []),
+    ("that one was hard", []),
+]
+ANSWER_MESSAGES = [message for message, _ in ANSWER_CASES]
+
+def check_answer_cases():
+    failures = [(message, expected, Harrow.extract_answers_from_content(message))
+                for message, expected in ANSWER_CASES
+                if Harrow.extract_answers_from_content(message) != expected]
+    if failures:
+        raise AssertionError("Parser cases failed: " + "; ".join(
+            f"{message!r} gave {actual}, expected {expected}" for message, expected, actual in failures))
+
+@benchmark("extract_answer_from_content")
+def bench_extract_answer():
+    check_answer_cases()
+    messages = ANSWER_MESSAGES
+    return lambda: [Harrow.extract_answer_from_content(m) for m in messages]
+
+@benchmark("extract_answers_from_content")
+def bench_extract_answers():
+    check_answer_cases()
+    messages = ANSWER_MESSAGES
+    return lambda: [Harrow.extract_answers_from_content(m) for m in messages]
+
+@benchmark("player.streak_cycle")
+def bench_player_streak():
+    """Twelve correct answers through every multiplier tier, then a ride-or-die miss"""
+    player = Harrow.Player(1, "bench")
+
+    def run():
+        for _ in range(12):
+            player.correct_answer()
+        player.is_ride_or_die = True
+        player.wrong_answer()
+    return run
+
+@benchmark("apply_challenge_answers")
+def bench_apply_challenge_answers():
+    challenge = make_challenge()
+    player, tracker = challenge.players[1], challenge.pace[1]
+    clock = iter(range(10**12))
+    return lambda: Harrow.apply_challenge_answers(player, tracker, challenge.config, ['correct'], next(clock) * 3.0)
+
+for size in (10, 1_000, 100_000):
+    @benchmark(f"mono.get_leaderboard[top{Harrow.MONO_LEADERBOARD_SIZE},n={size}]")
+    def bench_mono_top(size=size):
+        session = make_mono_session(size)
+        return lambda: session.get_leaderboard(Harrow.MONO_LEADERBOARD_SIZE)
+
+    @benchmark(f"mono.get_leaderboard[all,n={size}]")
+    def bench_mono_all(size=size):
+        session = make_mono_session(size)
+        return lambda: session.get_leaderboard()
+
+    @benchmark(f"mono.update_rank[n={size}]")
+    def bench_mono_update(size=size):
+        session = make_mono_session(size)
+        participant = session.participants[size // 2]
+        scores = iter(range(10**12))
+
+        def run():
+            participant.percentage = next(scores) % 101
+            session.update_rank(participant.user_id)
+        return run
+
+    @benchmark(f"show_mono_leaderboard[n={size}]", kind='async')
+    def bench_show_mono(size=size):
+        session = make_mono_session(size)
+        ctx = FakeChannel()
+        return lambda: Harrow.show_mono_leaderboard(ctx, session)
+
+# Database helpers, each against the same temp database with the write-behind queue running
+
+@benchmark("db.save_game_stats+flush", kind='db')
+def bench_save_game_stats():
+    session = Harrow.GameSession(1000)
+    for user_id in range(4):
+        session.add_player(user_id, f"user{user_id}")
+
+    async def run():
+        await Harrow.save_game_stats(session)
+        await Harrow.write_queue.flush()
+    return run
+
+@benchmark("db.save_challenge_stats+flush", kind='db')
+def bench_save_challenge_stats():
+    challenge = make_challenge()
+
+    async def run():
+        await Harrow.save_challenge_stats(challenge)
+        await Harrow.write_queue.flush()
+    return run
+
+@benchmark("db.record_answer_events[x50]+flush", kind='db')
+def bench_record_answer_events():
+    challenge = make_challenge()
+    answers = ['correct', 'wrong'] * 25
+
+    async def run():
+        snowflake = discord.utils.time_snowflake(discord.utils.utcnow())
+        Harrow.record_answer_events(challenge, 1, answers, 'direct', snowflake)
+        await Harrow.write_queue.flush()
+    return run
+
+@benchmark("db.record_leaderboard_delta+flush", kind='db')
+def bench_record_leaderboard_delta():
+    async def run():
+        Harrow.record_leaderboard_delta(1, 42, "bench", points=4, correct=1)
+        await Harrow.write_queue.flush()
+    return run
+
+@benchmark("db.save_mono_session", kind='db')
+def bench_save_mono_session():
+    session = Harrow.MonoSession(1, "BENCH", 1000, "Benchmark", guild_id=1)
+    return lambda: Harrow.save_mono_session(session)
+
+@benchmark("db.save_mono_score+flush", kind='db')
+def bench_save_mono_score():
+    async def run():
+        await Harrow.save_mono_score(1, 42, "bench", 180, 45, 50, 90.0)
+        await Harrow.write_queue.flush()
+    return run
+
+@benchmark("db.webhook_roundtrip", kind='db')
+def bench_webhook_roundtrip():
+    """save_user_webhook_to_db, get_user_webhook_from_db and remove_user_webhook_from_db"""
+    async def run():
+        await Harrow.save_user_webhook_to_db(42, 1, 99, "https://discord.com/api/webhooks/99/x")
+        await Harrow.get_user_webhook_from_db(42, 1)
+        await Harrow.remove_user_webhook_from_db(42, 1)
+    return run
+
+@benchmark("db.save_logging_channel", kind='db')
+def bench_save_logging_channel():
+    return lambda: Harrow.save_logging_channel(1, 3000)
+
+@benchmark("db.bot_meta_roundtrip", kind='db')
+def bench_bot_meta():
+    async def run():
+        await Harrow.set_bot_meta('benchmark', 'value')
+        await Harrow.get_bot_meta('benchmark')
+    return run
+
+@benchmark("db.get_server_leaderboard[week]", kind='db')
+def bench_server_leaderboard():
+    return lambda: Harrow.get_server_leaderboard(1, 7)
+
+@benchmark("db.get_pace_history", kind='db')
+def bench_pace_history():
+    return lambda: Harrow.get_pace_history(1, 1)
+
+async def seed_database():
+    """Enough rows that the read helpers have something to scan"""
+    challenge = make_challenge()
+    base = time.time() - 3600
+    for i in range(2_000):
+        moment = datetime.fromtimestamp(base + i, tz=timezone.utc)
+        Harrow.record_answer_events(challenge, 1 + i % 2, ['correct'], 'direct', discord.utils.time_snowflake(moment))
+    for user_id in range(500):
+        Harrow.record_leaderboard_delta(1, user_id, f"user{user_id}", points=user_id, correct=user_id)
+    await Harrow.write_queue.flush()
+
+async def run_benchmarks(selected):
+    results = {}
+    # Rendering benchmarks go through the outbound dispatcher; time the work, not Discord's rate limits
+    Harrow.OUTBOUND_CHANNEL_RATE = (10**9, 1.0)
+    Harrow.outbound.global_bucket = Harrow.TokenBucket(10**9, 1.0)
+    db_benchmarks = [b for b in selected if b[1] == 'db']
+
+    for name, kind, factory in selected:
+        if kind == 'sync':
+            results[name] = time_sync(factory())
+        elif kind == 'async':
+            results[name] = await time_async(factory())
+        else:
+            continue
+        print_result(name, results[name])
+
+    if db_benchmarks:
+        with tempfile.TemporaryDirectory() as directory:
+            Harrow.db_manager.path = os.path.join(directory, "benchmark.db")
+            await Harrow.db_manager.open()
+            await Harrow.init_db()
+            # Time the commits rather than the queue's 250ms batching window; 1ms still
+            # lets records that are already queued share a batch
+            Harrow.write_queue.flush_interval = 0.001
+            Harrow.write_queue.start()
+            try:
+                await seed_database()
+                for name, _, factory in db_benchmarks:
+                    results[name] = await time_async(factory())
+                    print_result(name, results[name])
+            finally:
+                await Harrow.write_queue.stop()
+                await Harrow.db_manager.close()
+    return results
+
+def print_result(name, result):
+    print(f"{name:<50} {result['median_us']:>12.2f} us/op  (min {result['min_us']:.2f}, {result['loops']} loops)")
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    print(f"\nChange against {baseline_path} (median, negative is faster):")
+    for name, result in results.items():
+        if name in baseline:
+            change = (result['median_us'] / baseline[name]['median_us'] - 1) * 100
+            print(f"{name:<50} {change:>+8.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Harrow microbenchmarks")
+    parser.add_argument("-k", dest="filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    selected = [b for b in benchmarks if not args.filter or args.filter in b[0]]
+    # Keep Harrow's own startup chatter out of the results table
+    logging_level = Harrow.logging.getLogger().level
+    Harrow.logging.getLogger().setLevel(Harrow.logging.WARNING)
+    try:
+        results = asyncio.run(run_benchmarks(selected))
+    finally:
+        Harrow.logging.getLogger().setLevel(logging_level)
+
+    commit = current_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    sys.exit(main())